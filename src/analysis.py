@@ -5,7 +5,7 @@ import os
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from src.visualization import create_2d_figure, create_3d_figure, generate_html_content
+from src.visualization import create_2d_figure, create_3d_figure, save_html_content
 import copy
 
 def analyze_plate(df, plate, assay, mask, neg_ctrl_mask, sections, use_percentage=True, 
@@ -268,7 +268,7 @@ def analyze_all_plates(df, keys, mask_map, neg_ctrl_mask_map, section_grays, sec
     figures_3d_norm = {}  # Para las gráficas 3D normalizadas con S1
     
     for key in keys:
-        plate, assay = key.split("_")
+        plate, _, assay = key.partition("_")
         
         # Añadir información de diagnóstico
         with open(debug_file, 'a') as f_debug:
@@ -706,28 +706,9 @@ def analyze_all_plates(df, keys, mask_map, neg_ctrl_mask_map, section_grays, sec
 
     writer.close()
     
-    # Generar contenido HTML
-    html_content = generate_html_content(figures_2d, figures_2d_norm, figures_3d, figures_3d_norm)
-    
-    # Verificar que html_content no sea None antes de escribirlo
-    if html_content is None:
-        html_content = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Error en la generación de gráficos</title>
-        </head>
-        <body>
-            <h1>Error en la generación de gráficos</h1>
-            <p>No se pudieron generar los gráficos correctamente. Por favor, revise los datos e intente nuevamente.</p>
-        </body>
-        </html>
-        """
-
-    # Guardar el archivo HTML
+    # Escribir el archivo HTML directamente en disco, figura a figura
     html_path = os.path.join(out_dir, "all_plots.html")
-    with open(html_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    save_html_content(html_path, figures_2d, figures_2d_norm, figures_3d, figures_3d_norm)
     
     # Generar mensaje de resultado
     mode_text = "percentage change" if use_percentage else "absolute values"
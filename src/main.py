@@ -8,7 +8,6 @@ import logging
 from src.ui.app import PlateMaskApp
 from src.utils.logger import setup_logging
 from src.modules.config import Config
-from src.core.data.parser import parse_spectro_excel
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
@@ -33,6 +32,7 @@ def main():
         file_path = sys.argv[1]
         if os.path.exists(file_path) and file_path.endswith(('.xls', '.xlsx')):
             try:
+                from src.core.data.parser import parse_spectro_excel
                 df = parse_spectro_excel(file_path)
                 if not df.empty:
                     app.load_file(df, file_path)
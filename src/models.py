@@ -47,7 +47,9 @@ class PlateData:
         """Genera claves únicas para cada combinación placa-ensayo."""
         if self.df.empty:
             return []
-        return [f"{r.plate_no}_{r.assay}" for _, r in self.unique_plates.iterrows()]
+        # Concatenación vectorizada de columnas en lugar de iterrows() fila a fila
+        plates = self.unique_plates
+        return (plates['plate_no'].astype(str) + '_' + plates['assay'].astype(str)).tolist()
     
     def get_plate_data(self, plate_no, assay, hours=None):
         """
@@ -79,12 +81,20 @@ class PlateData:
         Returns:
             list: Lista de strings con formato 'plate_no_assay_hours'.
         """
+        return list(self.get_individual_plate_map())
+    
+    def get_individual_plate_map(self):
+        """
+        Obtiene las placas individuales junto con sus componentes.
+        
+        Returns:
+            dict: {'plate_no_assay_hours': (plate_no, assay, hours)} en orden de aparición.
+        """
         if self.df.empty:
-            return []
-            
-        all_plates = []
-        for _, row in self.df.iterrows():
-            plate_id = f"{row['plate_no']}_{row['assay']}_{row['hours']}"
-            if plate_id not in all_plates:
-                all_plates.append(plate_id)
-        return all_plates
+            return {}
+        
+        # Combinaciones únicas y etiquetas construidas de forma vectorizada
+        plates = self.df[['plate_no', 'assay', 'hours']].drop_duplicates()
+        labels = (plates['plate_no'].astype(str) + '_' + plates['assay'].astype(str)
+                  + '_' + plates['hours'].astype(str))
+        return dict(zip(labels, plates.itertuples(index=False, name=None)))
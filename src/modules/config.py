@@ -4,9 +4,12 @@ Handles loading and saving of all application settings.
 """
 import os
 import json
+import logging
 import numpy as np
 from platformdirs import user_config_dir
 
+logger = logging.getLogger('plate_analyzer')
+
 class Config:
     """Class to manage application configuration."""
     
@@ -45,8 +48,7 @@ class Config:
             with open(self.config_file, 'w') as f:
                 json.dump(config_data, f, indent=2)
         except IOError as e:
-            import logging
-            logging.getLogger('plate_analyzer').error(f"Error saving configuration to {self.config_file}: {e}")
+            logger.error(f"Error saving configuration to {self.config_file}: {e}")
     
     def load(self):
         """Load configuration from file."""
@@ -113,8 +115,7 @@ class Config:
             
             return True
         except Exception as e:
-            import logging
-            logging.getLogger('plate_analyzer').error(f"Error loading configuration: {e}")
+            logger.error(f"Error loading configuration: {e}")
             return False
     
     def add_recent_file(self, file_path):
@@ -145,6 +146,30 @@ class Config:
         self.section_grays[key] = grays.copy()
         self._dirty = True
     
+    def bulk_update(self, masks, neg_ctrl_masks, section_grays):
+        """
+        Update masks, negative control masks and section grays of several keys at once.
+        
+        Only the values that differ from the stored ones are copied, and the
+        configuration is marked dirty only if something changed.
+        
+        Args:
+            masks (dict): Masks by key.
+            neg_ctrl_masks (dict): Negative control masks by key.
+            section_grays (dict): Section grays by key.
+        """
+        for stored, new in ((self.masks, masks), (self.neg_ctrl_masks, neg_ctrl_masks)):
+            for key, mask in new.items():
+                old = stored.get(key)
+                if old is None or not np.array_equal(old, mask):
+                    stored[key] = mask.copy()
+                    self._dirty = True
+        for key, grays in section_grays.items():
+            grays = list(grays)
+            if self.section_grays.get(key) != grays:
+                self.section_grays[key] = grays
+                self._dirty = True
+    
     def update_sections(self, sections):
         """Update the sections configuration."""
         self.sections = sections
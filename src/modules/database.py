@@ -8,6 +8,8 @@ from datetime import datetime
 import pandas as pd
 import numpy as np  # Added to safely convert numpy scalars to Python types
 
+logger = logging.getLogger('plate_analyzer')
+
 DB_FILE = "data/plate_data.db"
 
 def get_db_connection():
@@ -42,9 +44,9 @@ def create_table():
                 )
             """)
             conn.commit()
-            logging.getLogger('plate_analyzer').info("Database table 'plate_readings' created.")
+            logger.info("Database table 'plate_readings' created.")
     except sqlite3.Error as e:
-        logging.getLogger('plate_analyzer').error(f"Database error while creating table: {e}")
+        logger.error(f"Database error while creating table: {e}")
         raise
 
 def _to_py(value):
@@ -81,7 +83,7 @@ def find_conflicts(data_df):
                 _to_py(row['y']),
                 row['assay']
             )
-            logging.getLogger('plate_analyzer').debug(f"find_conflicts query params: {params}")
+            logger.debug(f"find_conflicts query params: {params}")
             cursor.execute(query, params)
             match = cursor.fetchone()
             if match:
@@ -149,7 +151,7 @@ def get_all_records_as_df():
             df = pd.read_sql_query("SELECT * FROM plate_readings", conn)
             return df
         except Exception as e:
-            logging.getLogger('plate_analyzer').error(f"Error fetching all records from DB: {e}")
+            logger.error(f"Error fetching all records from DB: {e}")
             return pd.DataFrame() # Return empty df on error
 
 def delete_all_records():
@@ -158,7 +160,7 @@ def delete_all_records():
         cursor = conn.cursor()
         cursor.execute("DELETE FROM plate_readings")
         conn.commit()
-    logging.getLogger('plate_analyzer').warning("All records deleted from database by user action.")
+    logger.warning("All records deleted from database by user action.")
 
 # Ensure the table is created when the module is imported
 create_table()
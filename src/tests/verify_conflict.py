@@ -6,52 +6,21 @@ sys.path.append(os.getcwd())  # ensure src is importable
 from src.modules import database as db
 
 # Prepare sample DataFrame with intentional internal duplicate and new unique row
-sample_data = [
-    {
-        'file_path': 'test_script',
-        'date': '2024-07-01',
-        'hour': 1.0,
-        'plate': 'P1',
-        'well_name': 'A1',
-        'x': 1,
-        'y': 1,
-        'assay': 'A',
-        'theo_dose': 0,
-        'real_dose': 0,
-        'value': 0,
-        'is_neg_control': 0
-    },
-    {
-        'file_path': 'test_script',
-        'date': '2024-07-01',
-        'hour': 1.0,
-        'plate': 'P1',
-        'well_name': 'A1',
-        'x': 1,
-        'y': 1,
-        'assay': 'A',
-        'theo_dose': 0,
-        'real_dose': 0,
-        'value': 0,
-        'is_neg_control': 0
-    },  # duplicate primary key row
-    {
-        'file_path': 'test_script',
-        'date': '2024-07-01',
-        'hour': 2.0,
-        'plate': 'P1',
-        'well_name': 'A2',
-        'x': 1,
-        'y': 2,
-        'assay': 'A',
-        'theo_dose': 0,
-        'real_dose': 0,
-        'value': 0,
-        'is_neg_control': 0
-    },
-]
-
-df = pd.DataFrame(sample_data)
+# (the first two rows share the primary key; built column-wise so pandas keeps dtypes)
+df = pd.DataFrame({
+    'file_path': ['test_script'] * 3,
+    'date': ['2024-07-01'] * 3,
+    'hour': [1.0, 1.0, 2.0],
+    'plate': ['P1'] * 3,
+    'well_name': ['A1', 'A1', 'A2'],
+    'x': [1, 1, 1],
+    'y': [1, 1, 2],
+    'assay': ['A'] * 3,
+    'theo_dose': [0] * 3,
+    'real_dose': [0] * 3,
+    'value': [0] * 3,
+    'is_neg_control': [0] * 3
+})
 
 unique_df, dup_df = db.detect_internal_duplicates(df)
 print(f"Detected internal duplicates: {len(dup_df)} row(s)")
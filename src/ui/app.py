@@ -4,28 +4,88 @@ Main UI module for the plate analysis application.
 import os
 import customtkinter as ctk
 import webbrowser
-import pandas as pd
 import numpy as np
-from src.models import PlateData
-from src.ui.grid_view import PlateGridView
-import importlib
 from src.ui.legend import SectionLegend, WellStatusLegend
-from src.analysis import analyze_plate, analyze_all_plates
-from utils import save_masks_to_csv, load_masks_from_csv, save_neg_ctrl_masks_to_csv, load_neg_ctrl_masks_from_csv
-from utils import save_grays_to_csv, load_grays_from_csv
+from utils import save_masks_to_npz, save_grays_to_csv
 from src.modules.config import Config
 from src.ui.menu import AppMenu
 from src.utils.logger import setup_logging
-import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from src.modules import exporter
-from src.modules.database import find_conflicts, insert_records, replace_records, detect_internal_duplicates, get_all_records_as_df
-from src.ui.conflict_dialog import ConflictDialog
 import logging
+import traceback
 import re
+import itertools
+import functools
+import queue
+import threading
 from datetime import datetime
 
+logger = logging.getLogger('plate_analyzer')
+
+# Máscaras por defecto compartidas (solo lectura) por todas las placas sin editar;
+# _writable_mask hace la copia propia de la placa al primer cambio. Las máscaras
+# solo valen 0/1, así que se guardan como uint8 (1 byte por pocillo en lugar de 8)
+_MASK_DTYPE = np.uint8
+_DEFAULT_MASK = np.ones((8, 12), dtype=_MASK_DTYPE)
+_DEFAULT_MASK.flags.writeable = False
+_DEFAULT_NEG_CTRL_MASK = np.zeros((8, 12), dtype=_MASK_DTYPE)
+_DEFAULT_NEG_CTRL_MASK.flags.writeable = False
+
+
+def _same_masks(old, new):
+    """
+    Compare two mask dictionaries key by key.
+
+    Masks frozen in a snapshot stay shared until edited, so most pairs are the
+    same object and are not compared element by element.
+
+    Args:
+        old (dict): Previous masks by key.
+        new (dict): Current masks by key.
+
+    Returns:
+        bool: True if both have the same keys and equal masks.
+    """
+    return old.keys() == new.keys() and all(
+        old[key] is mask or np.array_equal(old[key], mask) for key, mask in new.items()
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _cycle_palette(base, n):
+    """
+    Repeat a color palette cyclically until it has n colors.
+
+    Args:
+        base (tuple): Base palette.
+        n (int): Number of colors needed.
+
+    Returns:
+        tuple: n colors; a tuple so the cached value cannot be modified.
+    """
+    return tuple(itertools.islice(itertools.cycle(base), n))
+
+
+def _valid_wells(wells):
+    """
+    Keep the wells that are (row, col) pairs inside the 8x12 plate.
+
+    Args:
+        wells (iterable): Candidate wells, e.g. as read from the configuration.
+
+    Returns:
+        list: Valid wells as (row, col) tuples of ints.
+    """
+    valid_wells = []
+    for well in wells:
+        if isinstance(well, (list, tuple)) and len(well) >= 2:
+            row, col = int(well[0]), int(well[1])
+            if 0 <= row < 8 and 0 <= col < 12:
+                valid_wells.append((row, col))
+    return valid_wells
+
+
 class PlateMaskApp(ctk.CTk):
     """Main class for the plate analysis application."""
     
@@ -44,29 +104,71 @@ class PlateMaskApp(ctk.CTk):
 
         # Initialize configuration
         self.config = config
+        # Opción auto-exclude resuelta una vez; se actualiza en _on_config_changed
+        self._auto_exclude = bool(getattr(self.config, 'auto_exclude_orphaned', False))
+        # Valores de configuración que afectan al dibujo de la cuadrícula
+        self._grid_config_sig = self._grid_config_signature()
         
         # Initialize empty data structures
         self.df = df
         self.plate_data = None
+        # Último DataFrame inicializado por _initialize_data
+        self._initialized_df = None
         self.keys = []
+        self._key_parts = {}
+        self._keys_by_assay = {}
+        self._keys_by_plate_assay = {}
         self.mask_map = {}
         self.neg_ctrl_mask_map = {}
         self.section_grays = {}
         self.sections = []
+        self.section_wells = []
         self.grid_sections = []
-        self.buttons = []
-        self.all_buttons = []
+        # Versión de las secciones; se incrementa cada vez que cambian para
+        # invalidar la geometría cacheada (máscara de huérfanos, bounding boxes)
+        self._sections_version = 0
+        self._cached_sections_version = None
+        self._section_wells_rc = []
+        self._cached_section_limits = [(0, 0, 7, 11)]
+        self._grid_sections_version = None
+        # La cuadrícula solo se reconstruye si cambia la placa visible, las
+        # secciones o algo marcado como sucio (datos, configuración, modo)
+        self._grid_dirty = True
+        self._last_built_key = None
+        self.grid_view = None
+        self.section_legend = None
+        self.well_status_legend = None
+        self._welcome_frame = None
+        self._recent_buttons = []
+        self._shown_recent_files = None
         self.assays = []
-        self.section_colors = ['#FF9999', '#99FF99', '#9999FF', '#FFFF99', '#FF99FF', '#99FFFF']
+        # Paleta base inmutable; _cycle_palette la repite hasta cubrir todas las secciones
+        self.section_colors = ('#FF9999', '#99FF99', '#9999FF', '#FFFF99', '#FF99FF', '#99FFFF')
         
         # Create tmp directory if it doesn't exist
         if not os.path.exists("tmp"):
             os.makedirs("tmp")
 
         # Archivos para guardar/cargar datos
-        self.mask_file = os.path.join("tmp", "last_masks.csv")
-        self.neg_ctrl_mask_file = os.path.join("tmp", "last_neg_ctrl_masks.csv")
+        # Máscaras y controles negativos de todas las placas en un único .npz
+        self.mask_file = os.path.join("tmp", "last_masks.npz")
         self.gray_file = os.path.join("tmp", "section_grays.csv")
+        # Escritura diferida de máscaras: una ráfaga de clics se guarda una sola vez
+        self._mask_flush_after = None
+        # Hay cambios en las máscaras todavía no entregados al hilo de escritura
+        self._masks_dirty = False
+        # Últimas máscaras encoladas (instantánea de solo lectura), para omitir escrituras sin cambios
+        self._queued_masks = None
+        # Las escrituras a disco se hacen en un hilo aparte para no bloquear la interfaz;
+        # el resultado de cada escritura vuelve por _io_results
+        self._io_queue = queue.Queue()
+        self._io_results = queue.Queue()
+        self._pending_mask_writes = 0
+        self._io_thread = threading.Thread(target=self._io_worker, daemon=True)
+        self._io_thread.start()
+        # Los análisis también corren en un hilo; el resultado vuelve por esta cola
+        self._analysis_thread = None
+        self._analysis_results = queue.Queue()
         
         # Initialize data if provided
         if df is not None:
@@ -88,42 +190,106 @@ class PlateMaskApp(ctk.CTk):
         
         # Vincular eventos
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
-        self.bind("<Configure>", self.on_resize)
 
     def _on_config_changed(self):
         """Handle configuration changes."""
+        self._auto_exclude = bool(getattr(self.config, 'auto_exclude_orphaned', False))
+        
         # Solo actualizar el nivel de log, sin crear nuevo archivo ni handlers
-        from src.utils.logger import setup_logging
         setup_logging(self.config)  # Ahora solo actualiza el nivel de log
 
-        # Rebuild the grid to reflect any other configuration changes
+        # Rebuild the grid only if a setting that affects it has changed
+        signature = self._grid_config_signature()
+        if signature == self._grid_config_sig:
+            return
+        self._grid_config_sig = signature
+        self._grid_dirty = True
         if hasattr(self, 'grid_frame'):
             self.build_grid()
     
+    def _grid_config_signature(self):
+        """Return the configuration values that affect the grid and its legends."""
+        return (self._auto_exclude, getattr(self.config, 'section_units', "grays"))
+    
     def _edit_sections(self):
         """Open the section editor dialog."""
+        # The orphaned wells are excluded once the new sections are confirmed
+        # (set_sections, called by AppMenu.on_sections_confirmed); the dialog is not modal
         self.menu.show_section_editor()
+    
+    def set_sections(self, sections):
+        """
+        Replace the plate sections and redraw the grid.
         
-        # After editing sections, update the orphaned wells if auto-exclude is enabled
-        if hasattr(self.config, 'auto_exclude_orphaned') and self.config.auto_exclude_orphaned:
+        The wells are validated here, as when the sections are loaded from the
+        configuration; sections without valid wells are skipped.
+        
+        Args:
+            sections (list): Section dictionaries with 'name' and 'wells' keys.
+        """
+        self.sections = []
+        self.section_names = []
+        self.section_wells = []
+        for s in sections:
+            try:
+                name = str(s.get('name', f'Section {len(self.sections) + 1}'))
+                # Validated here once; later code trusts section_wells
+                wells = _valid_wells(s.get('wells', []))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Error processing section {s}: {e}")
+                continue
+            if wells:
+                self.sections.append({'name': name, 'wells': wells})
+                self.section_names.append(name)
+                self.section_wells.append(wells)
+        self._sections_version += 1
+        
+        # Exclude the wells left outside the new sections, once for all plates
+        if self._auto_exclude:
             self._exclude_orphaned_wells()
-            self.build_grid()  # Rebuild grid to show updated excluded wells
+        
+        self.build_grid()
     
     def _initialize_data(self, df):
-        import logging
         """Initialize data structures with the provided DataFrame."""
+        # Nada que hacer si este mismo DataFrame ya está inicializado (p. ej. al volver a
+        # cargar los mismos datos); load_file asigna self.df antes de llamar aquí, así
+        # que se compara con el último DataFrame inicializado y no con self.df
+        if df is self._initialized_df and self.plate_data is not None:
+            return
+        
         try:
+            # pandas y el modelo se importan al cargar datos, no al arrancar la interfaz
+            import pandas as pd
+            from src.models import PlateData
+            
             self.df = df
             self.plate_data = PlateData(df)
+            self._grid_dirty = True
             
             # Ensure keys are valid strings
             self.keys = [str(k) for k in getattr(self.plate_data, 'keys', []) if k is not None]
+            # (placa, ensayo) de cada clave, para no repetir split("_") en cada bucle;
+            # partition siempre da dos partes, aunque la clave no tenga "_"
+            self._key_parts = {key: key.partition("_")[::2] for key in self.keys}
+            # Claves agrupadas por ensayo y por (placa, ensayo) para las acciones de copia
+            self._keys_by_assay = {}
+            self._keys_by_plate_assay = {}
+            for key, (plate, assay) in self._key_parts.items():
+                self._keys_by_assay.setdefault(assay, []).append(key)
+                self._keys_by_plate_assay.setdefault((plate, assay), []).append(key)
 
             # Get unique assays
             if 'assay' in self.df.columns:
-                self.assays = sorted(self.df['assay'].unique().tolist())
+                self.assays = np.sort(pd.unique(self.df['assay'].to_numpy())).tolist()
             else:
                 self.assays = []
+            
+            # Índice ordenado (placa, ensayo, horas) para localizar placas individuales
+            if {'plate_no', 'assay', 'hours'}.issubset(self.df.columns):
+                self._plate_index = self.df.set_index(['plate_no', 'assay', 'hours'], drop=False).sort_index()
+            else:
+                self._plate_index = None
 
             # Update assay combobox if it exists
             if hasattr(self, 'assay_combo'):
@@ -144,18 +310,15 @@ class PlateMaskApp(ctk.CTk):
                         wells = s.get('wells', [])
                         # Ensure wells is a list of tuples
                         if isinstance(wells, (list, tuple)):
-                            valid_wells = []
-                            for well in wells:
-                                if isinstance(well, (list, tuple)) and len(well) >= 2:
-                                    valid_wells.append((int(well[0]), int(well[1])))
+                            # Validated here once; later code trusts section_wells
+                            valid_wells = _valid_wells(wells)
                             
                             if valid_wells:  # Only add if we have valid wells
                                 self.sections.append((name, valid_wells))
                                 self.section_names.append(name)
                                 self.section_wells.append(valid_wells)
                     except Exception as e:
-                        import logging
-                        logging.getLogger('plate_analyzer').warning(f"Error processing section {s}: {e}")
+                        logger.warning(f"Error processing section {s}: {e}")
                         continue
             
             # If no valid sections were loaded, use defaults
@@ -171,23 +334,21 @@ class PlateMaskApp(ctk.CTk):
                         try:
                             # Ensure limits is a 4-tuple of integers
                             if not isinstance(limits, (tuple, list)) or len(limits) != 4:
-                                logging.getLogger('plate_analyzer').warning(f"Invalid limits format for section {name}: {limits}")
+                                logger.warning(f"Invalid limits format for section {name}: {limits}")
                                 continue
                             r1, c1, r2, c2 = map(int, limits)
-                            # Generate well coordinates
-                            wells = []
-                            for row in range(min(r1, r2), max(r1, r2) + 1):
-                                for col in range(min(c1, c2), max(c1, c2) + 1):
-                                    wells.append((row, col))
+                            # Generate well coordinates (row-major, as (row, col) tuples)
+                            rows, cols = np.mgrid[min(r1, r2):max(r1, r2) + 1, min(c1, c2):max(c1, c2) + 1]
+                            wells = list(zip(rows.ravel().tolist(), cols.ravel().tolist()))
                             if wells:  # Only add if we have valid wells
                                 self.sections.append((str(name), wells))
                                 self.section_names.append(str(name))
                                 self.section_wells.append(wells)
                         except (ValueError, TypeError) as e:
-                            logging.getLogger('plate_analyzer').error(f"Error creating default section {name} with limits {limits}: {e}")
+                            logger.error(f"Error creating default section {name} with limits {limits}: {e}")
                             continue
                 except Exception as e:
-                    logging.getLogger('plate_analyzer').error(f"Error initializing default sections: {e}")
+                    logger.error(f"Error initializing default sections: {e}")
                     traceback.print_exc()
                     # If we still don't have sections, create a single section with all wells
                     if not self.sections:
@@ -197,9 +358,12 @@ class PlateMaskApp(ctk.CTk):
                         self.section_wells = [all_wells]
 
             
+            # Pocillos fuera de toda sección, calculados una sola vez para todas las placas
+            self._sections_version += 1
+            self._section_geometry()
+            
             # Set section colors
-            self.section_colors = getattr(self.plate_data, 'section_colors', 
-                                       ['#FF9999', '#99FF99', '#9999FF', '#FFFF99', '#FF99FF', '#99FFFF'])
+            self.section_colors = tuple(getattr(self.plate_data, 'section_colors', self.section_colors))
             
             # Initialize mask maps
             if not hasattr(self, 'mask_map'):
@@ -209,176 +373,221 @@ class PlateMaskApp(ctk.CTk):
             if not hasattr(self, 'section_grays'):
                 self.section_grays = {}
             
-            # Ensure default masks and gray values for all plate-assay keys
+            # Initialize masks and grays from config if available, otherwise keep the
+            # current ones or use the defaults (shared read-only arrays)
+            default_grays = [0] * len(self.section_wells)
             for key in self.keys:
-                self.mask_map.setdefault(key, np.ones((8, 12), dtype=float))
-                self.neg_ctrl_mask_map.setdefault(key, np.zeros((8, 12), dtype=float))
-                self.section_grays.setdefault(key, [0] * len(self.section_wells))
+                mask = self.config.masks.get(key)
+                if mask is not None and np.shape(mask) == (8, 12):
+                    self.mask_map[key] = np.array(mask, dtype=_MASK_DTYPE)
+                else:
+                    if mask is not None:
+                        logger.warning(f"Invalid mask for {key} in configuration, ignoring it")
+                    self.mask_map.setdefault(key, _DEFAULT_MASK)
+                
+                neg_ctrl_mask = self.config.neg_ctrl_masks.get(key)
+                if neg_ctrl_mask is not None and np.shape(neg_ctrl_mask) == (8, 12):
+                    self.neg_ctrl_mask_map[key] = np.array(neg_ctrl_mask, dtype=_MASK_DTYPE)
+                else:
+                    if neg_ctrl_mask is not None:
+                        logger.warning(f"Invalid negative control mask for {key} in configuration, ignoring it")
+                    self.neg_ctrl_mask_map.setdefault(key, _DEFAULT_NEG_CTRL_MASK)
+                
+                if key in self.config.section_grays:
+                    self.section_grays[key] = list(self.config.section_grays[key])
+                elif key not in self.section_grays:
+                    self.section_grays[key] = default_grays.copy()
             
             # Handle orphaned wells if auto-exclude is enabled
-            if hasattr(self.config, 'auto_exclude_orphaned') and self.config.auto_exclude_orphaned:
+            if self._auto_exclude:
                 self._exclude_orphaned_wells()
+            
+            self._initialized_df = df
                 
         except Exception as e:
-            logging.getLogger('plate_analyzer').error(f"Error in _initialize_data: {str(e)}")
-            import traceback
-            logging.getLogger('plate_analyzer').error(traceback.format_exc())
+            logger.error(f"Error in _initialize_data: {str(e)}")
+            logger.error(traceback.format_exc())
             raise  # Re-raise the exception to be handled by the caller
     
     def _exclude_orphaned_wells(self):
-        import logging
         """Exclude wells that don't belong to any section."""
         try:
             # Ensure we have the required attributes
             if not hasattr(self, 'mask_map'):
                 self.mask_map = {}
             if not hasattr(self, 'keys') or not self.keys:
-                logging.getLogger('plate_analyzer').info("No plate keys found for excluding orphaned wells")
+                logger.info("No plate keys found for excluding orphaned wells")
                 return
             if not hasattr(self, 'section_wells') or not self.section_wells:
-                logging.getLogger('plate_analyzer').info("No section wells defined for excluding orphaned wells")
+                logger.info("No section wells defined for excluding orphaned wells")
                 return
-            # Create a set of all possible well coordinates (0-7 rows, 0-11 cols)
-            all_wells = set((i, j) for i in range(8) for j in range(12))
-            section_wells = set()
-            # Get all wells that are in sections
-            for well_list in self.section_wells:
-                if not isinstance(well_list, (list, tuple)):
-                    continue
-                for well in well_list:
-                    try:
-                        if isinstance(well, (list, tuple)) and len(well) >= 2:
-                            row = int(well[0]) if hasattr(well, '__getitem__') else 0
-                            col = int(well[1]) if hasattr(well, '__getitem__') and len(well) > 1 else 0
-                            if 0 <= row < 8 and 0 <= col < 12:
-                                section_wells.add((row, col))
-                    except (ValueError, TypeError, IndexError) as e:
-                        logging.getLogger('plate_analyzer').error(f"Error processing well {well}: {e}")
-                        continue
-            # Find orphaned wells (not in any section)
-            orphaned_wells = all_wells - section_wells
-            if not orphaned_wells:
-                logging.getLogger('plate_analyzer').info("No orphaned wells to exclude")
+            # Máscara booleana 8x12 de los pocillos que no pertenecen a ninguna sección
+            self._section_geometry()
+            n_orphaned = np.count_nonzero(self._orphan_mask)
+            if not n_orphaned:
+                logger.info("No orphaned wells to exclude")
                 return
-            logging.getLogger('plate_analyzer').info(f"Found {len(orphaned_wells)} orphaned wells to exclude")
-            # Exclude orphaned wells in all plates
-            for key in list(self.keys):  # Create a copy of keys to avoid modification during iteration
-                try:
-                    if not isinstance(key, str):
-                        logging.getLogger('plate_analyzer').warning(f"Skipping invalid key (not a string): {key}")
-                        continue
-                    if key not in self.mask_map:
-                        self.mask_map[key] = np.ones((8, 12), dtype=float)
-                    mask = self.mask_map[key]
-                    if not isinstance(mask, np.ndarray) or mask.shape != (8, 12):
-                        logging.getLogger('plate_analyzer').warning(f"Invalid mask for {key}, resetting to default")
-                        self.mask_map[key] = np.ones((8, 12), dtype=float)
-                        mask = self.mask_map[key]
-                    # Mark orphaned wells as excluded (0)
-                    for i, j in orphaned_wells:
-                        if 0 <= i < 8 and 0 <= j < 12:
-                            mask[i, j] = 0
-                except Exception as e:
-                    logging.getLogger('plate_analyzer').error(f"Error processing plate {key}: {e}")
-                    continue
+            logger.info(f"Found {n_orphaned} orphaned wells to exclude")
+            # Detectar de una vez, sobre un array (K, 8, 12), qué placas tienen algún
+            # huérfano sin excluir; solo esas reciben su propia copia (_writable_mask).
+            # Claves y máscaras ya se validan al cargarlas (_initialize_data)
+            masks_arr = np.stack([self.mask_map.setdefault(key, _DEFAULT_MASK) for key in self.keys])
+            pending = masks_arr[:, self._orphan_mask].any(axis=1)
+            for idx in np.flatnonzero(pending).tolist():
+                self._writable_mask(self.mask_map, self.keys[idx])[self._orphan_mask] = 0
+            if pending.any():
+                self._grid_dirty = True
         except Exception as e:
-            logging.getLogger('plate_analyzer').error(f"Error in _exclude_orphaned_wells: {str(e)}")
-            import traceback
-            logging.getLogger('plate_analyzer').error(traceback.format_exc())
-
-        # Initialize masks and grays from config if available
-        for key in self.keys:
-            # Initialize mask map
-            if key in self.config.masks:
-                self.mask_map[key] = self.config.masks[key].copy()
-            else:
-                self.mask_map[key] = np.ones((8, 12), dtype=float)
-            
-            # Initialize negative control mask
-            if key in self.config.neg_ctrl_masks:
-                self.neg_ctrl_mask_map[key] = self.config.neg_ctrl_masks[key].copy()
-            else:
-                self.neg_ctrl_mask_map[key] = np.zeros((8, 12), dtype=float)
-            
-            # Initialize section grays
-            if key in self.config.section_grays:
-                self.section_grays[key] = self.config.section_grays[key].copy()
-            else:
-                # Default to 6 sections if not specified
-                self.section_grays[key] = [0] * 6
-            
-            # Handle orphaned wells if auto-exclude is enabled
-            if hasattr(self.config, 'auto_exclude_orphaned') and self.config.auto_exclude_orphaned:
-                # Get all wells that are in sections
-                section_wells = set()
-                for wells in self.section_wells:
-                    section_wells.update(wells)
-                
-                # Find orphaned wells (not in any section)
-                all_wells = set((i, j) for i in range(8) for j in range(12))
-                orphaned_wells = all_wells - section_wells
-                
-                # Exclude orphaned wells
-                for i, j in orphaned_wells:
-                    self.mask_map[key][i, j] = 0
+            logger.error(f"Error in _exclude_orphaned_wells: {str(e)}")
+            logger.error(traceback.format_exc())
 
-    def _show_welcome_message(self):
-        """Show welcome message when no data is loaded."""
-        # Clear any existing content
-        for w in self.grid_frame.winfo_children():
-            w.destroy()
-            
-        for w in self.legend_frame.winfo_children():
-            w.destroy()
-        
-        # Create welcome message
-        welcome_frame = ctk.CTkFrame(self.grid_frame)
-        welcome_frame.pack(expand=True, fill="both", padx=20, pady=20)
-        
-        welcome_label = ctk.CTkLabel(
-            welcome_frame, 
-            text="Welcome to Plate Analyzer",
-            font=("Arial", 24, "bold")
-        )
-        welcome_label.pack(pady=(50, 20))
+    def _compute_section_coverage(self):
+        """
+        Build the flat array of section wells and the mask of the wells they cover.
         
-        instructions_label = ctk.CTkLabel(
-            welcome_frame,
-            text="Please use the File menu to load a data file.",
-            font=("Arial", 16)
-        )
-        instructions_label.pack(pady=10)
+        Returns:
+            tuple: (flat_wells, coverage_mask), a (W, 2) integer array with the
+                (row, col) of every section well and an 8x12 boolean mask, True
+                at the wells belonging to some section.
+        """
+        # section_wells holds validated (row, col) pairs (see _valid_wells)
+        wells = [well for well_list in self.section_wells for well in well_list]
+        flat_wells = np.asarray(wells, dtype=np.intp).reshape(-1, 2)
+        coverage_mask = np.zeros((8, 12), dtype=bool)
+        coverage_mask[flat_wells[:, 0], flat_wells[:, 1]] = True
+        return flat_wells, coverage_mask
+
+    def _section_geometry(self):
+        """
+        Return the geometry derived from the sections, recomputed only when they change.
         
-        # Add a button to open file dialog
-        load_button = ctk.CTkButton(
-            welcome_frame,
-            text="Load Data File",
-            command=lambda: self.menu.load_file()
-        )
-        load_button.pack(pady=20)
+        Returns:
+            tuple: (orphan_mask, orphaned_wells, grid_sections), where orphaned_wells
+                is a list of (row, col) tuples and grid_sections holds the
+                (r1, c1, r2, c2) bounding box of each section.
+        """
+        if self._cached_sections_version != self._sections_version:
+            # Todos los pocillos de sección en un único array (W, 2) y su máscara de
+            # cobertura: "¿está (i, j) en alguna sección?" es una consulta al array
+            self._section_flat_wells, self._section_coverage_mask = self._compute_section_coverage()
+            self._orphan_mask = ~self._section_coverage_mask
+            self._cached_orphaned_wells = [tuple(well) for well in np.argwhere(self._orphan_mask).tolist()]
+            # Filas y columnas de cada sección como arrays int8 separados (SoA),
+            # cortados del array plano sin volver a recorrer las tuplas
+            splits = np.cumsum([len(wells) for wells in self.section_wells], dtype=np.intp)[:-1]
+            self._section_wells_rc = list(zip(
+                np.split(self._section_flat_wells[:, 0].astype(np.int8), splits),
+                np.split(self._section_flat_wells[:, 1].astype(np.int8), splits)
+            )) if self.section_wells else []
+            # Bounding boxes (r1, c1, r2, c2) de todas las secciones en un array
+            # (n_sections, 4); las secciones vacías quedan en (0, 0, 0, 0)
+            self._grid_section_bboxes = np.zeros((len(self.section_wells), 4), dtype=np.int32)
+            # Índice de sección de cada pocillo (-1 = ninguna); si un pocillo está en
+            # varias secciones, gana la última, como en un dict {pocillo: sección}
+            self._well_section_index = np.full((8, 12), -1, dtype=np.int16)
+            for idx, (rows, cols) in enumerate(self._section_wells_rc):
+                if rows.size:
+                    self._well_section_index[rows, cols] = idx
+                    self._grid_section_bboxes[idx] = (rows.min(), cols.min(), rows.max(), cols.max())
+            self._cached_grid_sections = [tuple(bbox) for bbox in self._grid_section_bboxes.tolist()]
+            # Límites para el análisis: solo las secciones definidas por el usuario
+            # (section_wells va en paralelo a self.sections) y no vacías
+            n_user_sections = len(self.sections)
+            self._cached_section_limits = [
+                bbox for bbox, (rows, _) in zip(self._cached_grid_sections[:n_user_sections],
+                                                self._section_wells_rc[:n_user_sections])
+                if rows.size
+            ] or [(0, 0, 7, 11)]  # Si no hay secciones, usar la placa completa
+            self._cached_sections_version = self._sections_version
+        return self._orphan_mask, self._cached_orphaned_wells, self._cached_grid_sections
+
+    def _section_limits(self):
+        """
+        Return the (r1, c1, r2, c2) limits of the user sections used by the analyses.
         
+        Returns:
+            list: Bounding box of each non-empty section, or the whole plate if
+                there are no sections; cached until the sections change.
+        """
+        self._section_geometry()
+        return self._cached_section_limits
 
+    def _show_welcome_message(self):
+        """Show welcome message when no data is loaded."""
+        # Hide any existing content; the widgets are kept for reuse
+        self._hide_plate_view()
+        self._grid_sections_version = None
         
-        # Show recent files if available
-        if self.config.recent_files:
-            recent_label = ctk.CTkLabel(
-                welcome_frame,
-                text="Recent Files:",
-                font=("Arial", 16, "bold")
+        # Create welcome message (only the first time)
+        if self._welcome_frame is None:
+            self._welcome_frame = ctk.CTkFrame(self.grid_frame)
+            
+            welcome_label = ctk.CTkLabel(
+                self._welcome_frame, 
+                text="Welcome to Plate Analyzer",
+                font=("Arial", 24, "bold")
+            )
+            welcome_label.pack(pady=(50, 20))
+            
+            instructions_label = ctk.CTkLabel(
+                self._welcome_frame,
+                text="Please use the File menu to load a data file.",
+                font=("Arial", 16)
             )
-            recent_label.pack(pady=(30, 10))
+            instructions_label.pack(pady=10)
             
-            recent_frame = ctk.CTkFrame(welcome_frame, fg_color="transparent")
-            recent_frame.pack(pady=10)
+            # Add a button to open file dialog
+            load_button = ctk.CTkButton(
+                self._welcome_frame,
+                text="Load Data File",
+                command=self.menu.load_file
+            )
+            load_button.pack(pady=20)
             
-            for i, file_path in enumerate(self.config.recent_files[:5]):
-                file_name = os.path.basename(file_path)
-                recent_button = ctk.CTkButton(
-                    recent_frame,
-                    text=file_name,
-                    command=lambda path=file_path: self.menu.load_specific_file(path)
+            self._recent_label = ctk.CTkLabel(
+                self._welcome_frame,
+                text="Recent Files:",
+                font=("Arial", 16, "bold")
+            )
+            self._recent_frame = ctk.CTkFrame(self._welcome_frame, fg_color="transparent")
+        
+        self._welcome_frame.pack(expand=True, fill="both", padx=20, pady=20)
+        
+        # Show recent files if available, reusing the buttons already created;
+        # nothing to reconfigure if the list has not changed since the last time
+        recent_files = self.config.recent_files[:5]
+        if recent_files == self._shown_recent_files:
+            return
+        self._shown_recent_files = recent_files
+        if recent_files:
+            self._recent_label.pack(pady=(30, 10))
+            self._recent_frame.pack(pady=10)
+        else:
+            self._recent_label.pack_forget()
+            self._recent_frame.pack_forget()
+        
+        while len(self._recent_buttons) < len(recent_files):
+            self._recent_buttons.append(ctk.CTkButton(self._recent_frame))
+        
+        for i, recent_button in enumerate(self._recent_buttons):
+            if i < len(recent_files):
+                file_path = recent_files[i]
+                recent_button.configure(
+                    text=os.path.basename(file_path),
+                    command=functools.partial(self.menu.load_specific_file, file_path)
                 )
                 recent_button.pack(pady=5)
+            else:
+                recent_button.pack_forget()
+
+    def _hide_plate_view(self):
+        """Hide the plate grid and the legends without destroying them."""
+        if self.grid_view is not None:
+            self.grid_view.hide()
+        if self.section_legend is not None:
+            self.section_legend.pack_forget()
+        if self.well_status_legend is not None:
+            self.well_status_legend.pack_forget()
 
     def _setup_ui(self):
         """Configura los elementos de la interfaz de usuario."""
@@ -392,6 +601,8 @@ class PlateMaskApp(ctk.CTk):
         # Frame para modo avanzado
         self.advanced_mode = False
         self.advanced_frame = None
+        # Placas individuales del combo avanzado: etiqueta -> (plate_no, assay, hours)
+        self._individual_plates = {}
         
         # Frame principal de contenido
         self._setup_content_frame()
@@ -484,6 +695,17 @@ class PlateMaskApp(ctk.CTk):
         self.analyze_all_btn.configure(state=state)
 
 
+    def _set_result(self, text):
+        """
+        Replace the content of the result box.
+        
+        Args:
+            text (str): Whole message; multi-line messages are built first so the
+                box is updated with a single insert.
+        """
+        self.result_box.delete('1.0', ctk.END)
+        self.result_box.insert(ctk.END, text)
+
     def _setup_options_frame(self):
         """Configura el frame de opciones con checkboxes."""
         self.options_frame = ctk.CTkFrame(self)
@@ -523,19 +745,11 @@ class PlateMaskApp(ctk.CTk):
         self.instructions_label = ctk.CTkLabel(self.instructions_frame, text=instructions_text)
         self.instructions_label.pack(pady=5)
 
-    def on_resize(self, event):
-        """Maneja el evento de redimensionamiento de la ventana."""
-        # Solo responder a eventos de redimensionamiento de la ventana principal, no de widgets hijos
-        if event.widget == self:
-            # Actualizar el layout si es necesario
-            pass
-
     def toggle_advanced_mode(self):
         """Alterna entre modo simple y avanzado."""
         # Don't allow advanced mode if no data is loaded
         if self.df is None:
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, "Please load a data file first.")
+            self._set_result("Please load a data file first.")
             return
             
         self.advanced_mode = not self.advanced_mode
@@ -554,8 +768,9 @@ class PlateMaskApp(ctk.CTk):
                 plate_label = ctk.CTkLabel(self.advanced_frame, text="Individual Plate:")
                 plate_label.pack(side="left", padx=(0, 5))
                 
-                # Obtener lista de todas las placas individuales
-                all_plates = self.plate_data.get_all_individual_plates()
+                # Obtener todas las placas individuales, con sus componentes ya separados
+                self._individual_plates = self.plate_data.get_individual_plate_map()
+                all_plates = list(self._individual_plates)
                 
                 # Dropdown para selección de placa individual
                 self.plate_combo = ctk.CTkComboBox(self.advanced_frame, values=all_plates, width=300)
@@ -572,6 +787,7 @@ class PlateMaskApp(ctk.CTk):
                 self.advanced_frame.pack_forget()
         
         # Refrescar la cuadrícula
+        self._grid_dirty = True
         self.build_grid()
 
     def load_individual_plate(self):
@@ -583,23 +799,21 @@ class PlateMaskApp(ctk.CTk):
         if not selected:
             return
             
-        # Analizar la selección
-        parts = selected.split('_')
-        if len(parts) < 3:
+        # Componentes de la selección, calculados al crear la lista
+        parts = self._individual_plates.get(selected)
+        if parts is None:
             return
             
-        plate_no = parts[0]
-        assay = parts[1]
-        hours = float(parts[2])
-        
-        # Encontrar la fila correspondiente en el DataFrame
-        matching_rows = self.df[(self.df['plate_no'] == plate_no) & 
-                               (self.df['assay'] == assay) & 
-                               (self.df['hours'] == hours)]
-        
-        if matching_rows.empty:
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, "No matching plate found.")
+        plate_no, assay, hours = parts
+        
+        # Encontrar la fila correspondiente en el índice (placa, ensayo, horas)
+        try:
+            matching_rows = self._plate_index.loc[[(plate_no, assay, hours)]]
+        except (AttributeError, KeyError, TypeError):
+            matching_rows = None
+        
+        if matching_rows is None or matching_rows.empty:
+            self._set_result("No matching plate found.")
             return
             
         # Establecer la clave seleccionada a la placa-ensayo
@@ -610,12 +824,14 @@ class PlateMaskApp(ctk.CTk):
         self.current_individual_plate = matching_rows.iloc[0]
         
         # Actualizar la cuadrícula
+        self._grid_dirty = True
         self.build_grid()
         
         # Mostrar información en el cuadro de resultados
-        self.result_box.delete('1.0', ctk.END)
-        self.result_box.insert(ctk.END, f"Loaded individual plate: {selected}\n")
-        self.result_box.insert(ctk.END, f"Hours: {hours}\n")
+        self._set_result(
+            f"Loaded individual plate: {selected}\n"
+            f"Hours: {hours}\n"
+        )
 
     def on_select(self, choice):
         """Maneja la selección de una placa-ensayo diferente."""
@@ -624,7 +840,50 @@ class PlateMaskApp(ctk.CTk):
         # Limpiar selección de placa individual en modo avanzado
         if hasattr(self, 'current_individual_plate'):
             delattr(self, 'current_individual_plate')
-        self.build_grid()
+        
+        # Las secciones son las mismas para todas las placas: si la cuadrícula ya
+        # está construida para ellas, basta con recolorear los pocillos
+        if self.grid_view is not None and self._grid_sections_version == self._sections_version:
+            self._refresh_grid_for_key()
+        else:
+            self.build_grid()
+
+    def _refresh_grid_for_key(self):
+        """Muestra la placa-ensayo seleccionada reutilizando la cuadrícula y la leyenda actuales."""
+        plate, assay = self._key_parts[self.selected_key]
+        orphan_mask, orphaned_wells, _ = self._section_geometry()
+        self._exclude_orphans_from_selected(orphan_mask, orphaned_wells)
+        section_grays = self._selected_section_grays(len(self.grid_sections))
+        
+        self.grid_view.set_plate(plate, assay, self.mask_map[self.selected_key],
+                                 self.neg_ctrl_mask_map[self.selected_key])
+        self.section_legend.set_section_grays(section_grays)
+        self._last_built_key = self.selected_key
+
+    def _exclude_orphans_from_selected(self, orphan_mask, orphaned_wells):
+        """Aplica la máscara de pocillos huérfanos a la placa-ensayo seleccionada si auto-exclude está activo."""
+        if self._auto_exclude and orphaned_wells:
+            mask = self.mask_map.setdefault(self.selected_key, _DEFAULT_MASK)
+            # Copiar una máscara compartida solo si todavía tiene huérfanos sin excluir
+            if mask[orphan_mask].any():
+                mask = self._writable_mask(self.mask_map, self.selected_key)
+                mask[orphan_mask] = 0
+
+    def _selected_section_grays(self, n_sections):
+        """Devuelve los grays de la placa-ensayo seleccionada ajustados a n_sections secciones."""
+        # Initialize section grays if not exists
+        if self.selected_key not in self.section_grays:
+            self.section_grays[self.selected_key] = [0] * n_sections
+        
+        # Ensure section_grays has the correct length
+        current_grays = self.section_grays[self.selected_key]
+        if len(current_grays) < n_sections:
+            # Add zeros for new sections
+            current_grays.extend([0] * (n_sections - len(current_grays)))
+        elif len(current_grays) > n_sections:
+            # Truncate if we have fewer sections now
+            current_grays = current_grays[:n_sections]
+        return current_grays
 
     def build_grid(self):
         """Construye la cuadrícula de pocillos y la leyenda."""
@@ -633,187 +892,254 @@ class PlateMaskApp(ctk.CTk):
             self._show_welcome_message()
             return
             
-        # Limpiar frame de cuadrícula
-        for w in self.grid_frame.winfo_children():
-            w.destroy()
-            
-        # Limpiar frame de leyenda
-        for w in self.legend_frame.winfo_children():
-            w.destroy()
+        # Ocultar el mensaje de bienvenida; la cuadrícula y las leyendas se
+        # reutilizan en lugar de destruirlas y crearlas de nuevo
+        if self._welcome_frame is not None:
+            self._welcome_frame.pack_forget()
 
         if not self.selected_key:
+            self._hide_plate_view()
             return
-            
-        plate, assay = self.selected_key.split("_")
         
-        # Get all wells that are in sections
-        section_wells_set = set()
-        for wells in self.section_wells:
-            section_wells_set.update(wells)
+        # Nada que reconstruir si la placa visible y su geometría no han cambiado
+        if (not self._grid_dirty and self._last_built_key == self.selected_key
+                and self._grid_sections_version == self._sections_version):
+            return
+            
+        key = self.selected_key
+        plate, assay = self._key_parts[key]
         
-        # Find orphaned wells (not in any section)
-        all_wells = set((i, j) for i in range(8) for j in range(12))
-        orphaned_wells = all_wells - section_wells_set
+        # Find orphaned wells (not in any section); cached until the sections change
+        orphan_mask, orphaned_wells, grid_sections = self._section_geometry()
         
         # If auto-exclude is enabled, update the mask for orphaned wells
-        if hasattr(self.config, 'auto_exclude_orphaned') and self.config.auto_exclude_orphaned and orphaned_wells:
-            if self.selected_key not in self.mask_map:
-                self.mask_map[self.selected_key] = np.ones((8, 12), dtype=float)
-            
-            for i, j in orphaned_wells:
-                self.mask_map[self.selected_key][i, j] = 0
+        self._exclude_orphans_from_selected(orphan_mask, orphaned_wells)
+        # Máscaras de la placa visible, leídas una vez (después de excluir huérfanos)
+        mask = self.mask_map[key]
+        neg_ctrl_mask = self.neg_ctrl_mask_map[key]
+        current_individual_plate = getattr(self, 'current_individual_plate', None)
         
         # Adaptar secciones a formato esperado por PlateGridView (bounding boxes)
-        self.grid_sections = []
-        for idx, wells in enumerate(self.section_wells):
-            if wells:
-                rows = [i for i, j in wells]
-                cols = [j for i, j in wells]
-                r1, r2 = min(rows), max(rows)
-                c1, c2 = min(cols), max(cols)
-                self.grid_sections.append((r1, c1, r2, c2))
-            else:
-                self.grid_sections.append((0, 0, 0, 0))
+        self.grid_sections = list(grid_sections)
     
-        n_sections = len(self.grid_sections)
-        # Make sure we have enough colors for all sections
-        while len(self.section_colors) < n_sections:
-            self.section_colors.extend(self.section_colors[:n_sections - len(self.section_colors)])
-        section_colors = self.section_colors[:n_sections]
-        
         # Add a section for orphaned wells if auto-exclude is disabled
-        if hasattr(self.config, 'auto_exclude_orphaned') and not self.config.auto_exclude_orphaned and orphaned_wells:
-            rows = [i for i, j in orphaned_wells]
-            cols = [j for i, j in orphaned_wells]
-            if rows and cols:  # Only add if there are orphaned wells
-                r1, r2 = min(rows), max(rows)
-                c1, c2 = min(cols), max(cols)
-                self.grid_sections.append((r1, c1, r2, c2))
-                self.section_wells.append(list(orphaned_wells))
-                self.section_names.append("Orphaned Wells")
+        if not self._auto_exclude and orphaned_wells:
+            # Bounding box of the orphaned wells straight from the 8x12 boolean mask
+            rows, cols = np.nonzero(orphan_mask)
+            self.grid_sections.append((int(rows.min()), int(cols.min()), int(rows.max()), int(cols.max())))
+            self.section_wells.append(list(orphaned_wells))
+            self.section_names.append("Orphaned Wells")
+            self._sections_version += 1
         
         n_sections = len(self.grid_sections)
-        section_colors = (self.section_colors * ((n_sections // len(self.section_colors)) + 1))[:n_sections]
+        # Repetir la paleta cíclicamente hasta tener un color por sección (memorizado)
+        section_colors = _cycle_palette(self.section_colors, n_sections)
         
-        # Initialize section grays if not exists
-        if self.selected_key not in self.section_grays:
-            self.section_grays[self.selected_key] = [0] * n_sections
-        
-        # Ensure section_grays has the correct length
-        current_grays = self.section_grays[self.selected_key]
-        if len(current_grays) < n_sections:
-            # Add zeros for new sections
-            current_grays.extend([0] * (n_sections - len(current_grays)))
-        elif len(current_grays) > n_sections:
-            # Truncate if we have fewer sections now
-            current_grays = current_grays[:n_sections]
-        
-        section_grays = current_grays
+        section_grays = self._selected_section_grays(n_sections)
         # Crear vista de cuadrícula
-        grid_view = PlateGridView(
-            parent=self.grid_frame,
-            plate=plate,
-            assay=assay,
-            mask=self.mask_map[self.selected_key],
-            neg_ctrl_mask=self.neg_ctrl_mask_map[self.selected_key],
-            sections=self.grid_sections,
-            section_colors=section_colors,
-            toggle_well_callback=self.toggle_well,
-            toggle_negative_control_callback=self.toggle_negative_control,
-            advanced_mode=self.advanced_mode,
-            current_individual_plate=getattr(self, 'current_individual_plate', None)
-        )
-        # Crear leyendas con nombres personalizados
-
-
-        self.section_legend = SectionLegend(
-            parent=self.legend_frame,
-            section_colors=section_colors,
-            section_grays=section_grays,
-            save_callback=self.save_single_gray_value,
-            copy_callback=self.copy_grays_to_all_plates
-        )
+        if self.grid_view is None:
+            from src.ui.grid_view import PlateGridView
+            self.grid_view = PlateGridView(
+                parent=self.grid_frame,
+                plate=plate,
+                assay=assay,
+                mask=mask,
+                neg_ctrl_mask=neg_ctrl_mask,
+                sections=self.grid_sections,
+                section_colors=section_colors,
+                toggle_well_callback=self.toggle_well,
+                toggle_negative_control_callback=self.toggle_negative_control,
+                advanced_mode=self.advanced_mode,
+                current_individual_plate=current_individual_plate
+            )
+        else:
+            self.grid_view.update(
+                plate,
+                assay,
+                mask,
+                neg_ctrl_mask,
+                self.grid_sections,
+                section_colors,
+                advanced_mode=self.advanced_mode,
+                current_individual_plate=current_individual_plate
+            )
+        
+        # Crear leyendas con nombres personalizados (solo la primera vez)
+        if self.section_legend is None:
+            self.section_legend = SectionLegend(
+                parent=self.legend_frame,
+                section_colors=section_colors,
+                section_grays=section_grays,
+                save_callback=self.save_single_gray_value,
+                copy_callback=self.copy_grays_to_all_plates
+            )
+        else:
+            self.section_legend.set_sections(section_colors, section_grays)
         self.section_legend.pack(pady=(0, 10), fill="x")
-        self.well_status_legend = WellStatusLegend(
-            parent=self.legend_frame
-        )
+        if self.well_status_legend is None:
+            self.well_status_legend = WellStatusLegend(
+                parent=self.legend_frame
+            )
+        else:
+            # Reutilizada: el modo claro/oscuro puede haber cambiado desde que se creó
+            self.well_status_legend.refresh_theme()
         self.well_status_legend.pack(pady=(10, 0), fill="x")
-        # Almacenar referencias a los botones
-        self.buttons = grid_view.buttons
-        self.all_buttons = grid_view.all_buttons
         # Almacenar referencias a las entradas de grises
         self.gray_entries = self.section_legend.gray_entries
+        self._grid_sections_version = self._sections_version
+        self._grid_dirty = False
+        self._last_built_key = key
         
 
 
+    def _writable_mask(self, mask_map, key):
+        """
+        Return the mask of a plate-assay ready to be modified in place.
+        
+        Default masks and masks copied between plates are shared read-only
+        arrays; the first edit gives the plate its own copy (copy-on-write).
+        
+        Args:
+            mask_map (dict): Dictionary of masks (well or negative control).
+            key (str): Plate-assay key.
+            
+        Returns:
+            numpy.ndarray: Writable mask stored in mask_map[key].
+        """
+        mask = mask_map[key]
+        if not mask.flags.writeable:
+            mask = mask.copy()
+            mask_map[key] = mask
+        return mask
+
+    def _share_selected_masks(self, keys):
+        """
+        Give the given plate-assays the masks of the selected one without copying them.
+        
+        The selected masks are made read-only and shared by reference; whichever
+        plate is edited first gets its own copy through _writable_mask.
+        
+        Args:
+            keys (iterable): Plate-assay keys that receive the masks.
+        """
+        current_mask = self.mask_map[self.selected_key]
+        current_mask.flags.writeable = False
+        current_neg_ctrl_mask = self.neg_ctrl_mask_map[self.selected_key]
+        current_neg_ctrl_mask.flags.writeable = False
+        
+        for key in keys:
+            self.mask_map[key] = current_mask
+            self.neg_ctrl_mask_map[key] = current_neg_ctrl_mask
+
+    def _schedule_mask_flush(self):
+        """Programa el guardado de las máscaras, cancelando cualquier guardado pendiente."""
+        self._masks_dirty = True
+        if self._mask_flush_after is not None:
+            self.after_cancel(self._mask_flush_after)
+        self._mask_flush_after = self.after(250, self._flush_masks)
+
+    def _flush_masks(self):
+        """Guarda las máscaras de todas las placas en disco."""
+        self._mask_flush_after = None
+        if not self._masks_dirty:
+            return
+        self._masks_dirty = False
+        # Un doble clic sobre el mismo pocillo deja las máscaras como estaban.
+        # Se compara con lo último encolado, no con lo último escrito: si se
+        # comparase con lo escrito, deshacer un cambio aún en cola se omitiría
+        # y la escritura pendiente dejaría el estado deshecho en el archivo
+        if self._queued_masks is not None and (
+                _same_masks(self._queued_masks[0], self.mask_map)
+                and _same_masks(self._queued_masks[1], self.neg_ctrl_mask_map)):
+            return
+        
+        self._queued_masks = self._freeze_masks()
+        self._io_queue.put(self._queued_masks)
+        self._pending_mask_writes += 1
+        if self._pending_mask_writes == 1:
+            self.after(250, self._poll_mask_writes)
+
+    def _drain_mask_write_results(self):
+        """
+        Collect the results of the finished mask writes.
+        
+        Returns:
+            bool: True if any of them failed.
+        """
+        failed = False
+        while True:
+            try:
+                ok = self._io_results.get_nowait()
+            except queue.Empty:
+                return failed
+            self._pending_mask_writes -= 1
+            failed = failed or not ok
+
+    def _poll_mask_writes(self):
+        """Comprueba las escrituras de máscaras en curso y reintenta las que fallan."""
+        if self._drain_mask_write_results():
+            # El archivo no refleja lo encolado: olvidarlo y volver a escribir
+            self._queued_masks = None
+            self._masks_dirty = True
+            if self._mask_flush_after is None:
+                self._mask_flush_after = self.after(2000, self._flush_masks)
+        if self._pending_mask_writes:
+            self.after(250, self._poll_mask_writes)
+
+    def _freeze_masks(self):
+        """
+        Take a snapshot of the masks of all plates without copying them.
+        
+        The masks become read-only and _writable_mask copies whichever is edited
+        afterwards, so a worker thread never sees half-made changes.
+        
+        Returns:
+            tuple: (mask_map, neg_ctrl_mask_map) shallow copies of the dictionaries.
+        """
+        for mask_map in (self.mask_map, self.neg_ctrl_mask_map):
+            for mask in mask_map.values():
+                mask.flags.writeable = False
+        return dict(self.mask_map), dict(self.neg_ctrl_mask_map)
+
+    def _io_worker(self):
+        """Escribe en disco las instantáneas de máscaras encoladas por _flush_masks."""
+        while True:
+            item = self._io_queue.get()
+            if item is None:
+                break
+            mask_map, neg_ctrl_mask_map = item
+            # Tkinter no es seguro entre hilos: el resultado lo recoge _poll_mask_writes
+            self._io_results.put(save_masks_to_npz(self.mask_file, mask_map, neg_ctrl_mask_map))
+
     def toggle_well(self, i, j):
-        import logging
         """Alterna el valor de máscara de un pocillo sin reconstruir toda la cuadrícula."""
         # Voltear máscara en la posición (i,j)
-        m = self.mask_map[self.selected_key]
+        m = self._writable_mask(self.mask_map, self.selected_key)
         neg_ctrl_m = self.neg_ctrl_mask_map[self.selected_key]
         
         # Alternar máscara normal (incluso si es un control negativo)
         m[i,j] = 0 if m[i,j] == 1 else 1
-        logging.getLogger('plate_analyzer').debug(f"toggle_well called with i={i}, j={j}")
-        logging.getLogger('plate_analyzer').debug(f"len(self.buttons) = {len(self.buttons)}")
-        if len(self.buttons) > 0 and isinstance(self.buttons[0], list):
-            logging.getLogger('plate_analyzer').debug(f"len(self.buttons[0]) = {len(self.buttons[0])}")
-        # Actualizar color del botón basado en ambas máscaras
-        button = self.buttons[i][j]
-        if neg_ctrl_m[i,j] == 1 and m[i,j] == 0:
-            # Ambos control negativo y excluido
-            button.configure(fg_color='#800080', border_color='#ff0000', border_width=2)
-        elif neg_ctrl_m[i,j] == 1:
-            # Solo control negativo
-            button.configure(fg_color='#800080', border_width=0)
-        elif m[i,j] == 0:
-            # Solo excluido
-            button.configure(fg_color='#ff0000', border_width=0)
-        else:
-            # Pocillo normal
-            button.configure(fg_color='transparent', border_width=0)
-        
-        # Guardar máscaras en CSV después de cada cambio
-        save_masks_to_csv(self.mask_file, self.mask_map)
-        
-        # Update the configuration
-        self.config.update_masks(self.selected_key, self.mask_map[self.selected_key])
+        logger.debug("toggle_well called with i=%d, j=%d", i, j)
+        self._restyle_well(i, j, m, neg_ctrl_m)
 
     def toggle_negative_control(self, i, j):
-        import logging
         """Alterna un pocillo como control negativo con clic derecho."""
         # Obtener máscaras
         m = self.mask_map[self.selected_key]
-        neg_ctrl_m = self.neg_ctrl_mask_map[self.selected_key]
+        neg_ctrl_m = self._writable_mask(self.neg_ctrl_mask_map, self.selected_key)
         
         # Alternar estado de control negativo
         neg_ctrl_m[i,j] = 0 if neg_ctrl_m[i,j] == 1 else 1
-        import logging
-        logging.getLogger('plate_analyzer').debug(f"toggle_negative_control called with i={i}, j={j}")
-        logging.getLogger('plate_analyzer').debug(f"len(self.buttons) = {len(self.buttons)}")
-        if len(self.buttons) > 0 and isinstance(self.buttons[0], list):
-            logging.getLogger('plate_analyzer').debug(f"len(self.buttons[0]) = {len(self.buttons[0])}")
-        # Actualizar color del botón basado en ambas máscaras
-        button = self.buttons[i][j]
-        if neg_ctrl_m[i,j] == 1 and m[i,j] == 0:
-            # Ambos control negativo y excluido
-            button.configure(fg_color='#800080', border_color='#ff0000', border_width=2)
-        elif neg_ctrl_m[i,j] == 1:
-            # Solo control negativo
-            button.configure(fg_color='#800080', border_width=0)
-        elif m[i,j] == 0:
-            # Solo excluido
-            button.configure(fg_color='#ff0000', border_width=0)
-        else:
-            # Pocillo normal
-            button.configure(fg_color='transparent', border_width=0)
-        
-        # Guardar máscaras en CSV después de cada cambio
-        save_neg_ctrl_masks_to_csv(self.neg_ctrl_mask_file, self.neg_ctrl_mask_map)
+        logger.debug("toggle_negative_control called with i=%d, j=%d", i, j)
+        self._restyle_well(i, j, m, neg_ctrl_m)
+
+    def _restyle_well(self, i, j, m, neg_ctrl_m):
+        """Recolorea un pocillo editado y programa el guardado de las máscaras."""
+        # Actualizar color del pocillo basado en ambas máscaras
+        self.grid_view.update_well(i, j, m[i,j], neg_ctrl_m[i,j])
         
-        # Update the configuration
-        self.config.update_neg_ctrl_masks(self.selected_key, self.neg_ctrl_mask_map[self.selected_key])
+        # Guardar máscaras en disco cuando termine la ráfaga de clics
+        self._schedule_mask_flush()
 
     def _copy_selection_to_selected_assay(self):
         """Copies the current mask to all plates with the selected assay."""
@@ -826,27 +1152,18 @@ class PlateMaskApp(ctk.CTk):
         if not self.selected_key:
             return
             
-        plate, assay = self.selected_key.split("_")
-        current_mask = self.mask_map[self.selected_key].copy()
-        current_neg_ctrl_mask = self.neg_ctrl_mask_map[self.selected_key].copy()
-        
+        plate, assay = self._key_parts[self.selected_key]
         # Encontrar todas las placas con el mismo número de placa y ensayo
-        for key in self.keys:
-            key_plate, key_assay = key.split("_")
-            if key_plate == plate and key_assay == assay:
-                self.mask_map[key] = current_mask.copy()
-                self.neg_ctrl_mask_map[key] = current_neg_ctrl_mask.copy()
+        self._share_selected_masks(self._keys_by_plate_assay.get((plate, assay), ()))
         
-        # Refrescar si se está viendo la misma placa
-        self.build_grid()
+        # La placa visible es el origen de la copia, así que la cuadrícula ya muestra
+        # estas máscaras y no hace falta reconstruirla
         
-        # Guardar máscaras en CSV después de copiar
-        save_masks_to_csv(self.mask_file, self.mask_map)
-        save_neg_ctrl_masks_to_csv(self.neg_ctrl_mask_file, self.neg_ctrl_mask_map)
+        # Guardar máscaras en disco después de copiar
+        self._schedule_mask_flush()
         
         # Mostrar confirmación
-        self.result_box.delete('1.0', ctk.END)
-        self.result_box.insert(ctk.END, f"Selection copied to all time points of plate {plate}_{assay}\n")
+        self._set_result(f"Selection copied to all time points of plate {plate}_{assay}\n")
 
     def analyze_all(self):
         """Analiza todas las placas y genera visualizaciones."""
@@ -856,88 +1173,80 @@ class PlateMaskApp(ctk.CTk):
         use_bar_chart = self.bar_chart_var.get()
         subtract_neg_ctrl = self.subtract_neg_ctrl_var.get()
         
-        # Convertir secciones al formato esperado (r1, c1, r2, c2)
-        section_limits = []
-        for section in self.sections:
-            if isinstance(section, tuple) and len(section) == 2:
-                # Si es una tupla (name, wells), obtener los límites
-                name, wells = section
-                if wells:  # Si hay pocillos en la sección
-                    rows = [w[0] for w in wells]
-                    cols = [w[1] for w in wells]
-                    section_limits.append((min(rows), min(cols), max(rows), max(cols)))
-            elif isinstance(section, dict) and 'wells' in section:
-                # Si es un diccionario con clave 'wells'
-                wells = section['wells']
-                if wells:  # Si hay pocillos en la sección
-                    rows = [w[0] for w in wells]
-                    cols = [w[1] for w in wells]
-                    section_limits.append((min(rows), min(cols), max(rows), max(cols)))
-        
-        # Si no hay secciones, usar la placa completa
-        if not section_limits:
-            section_limits = [(0, 0, 7, 11)]  # Toda la placa
-        
-        # Realizar análisis completo
-        result_message, html_path = analyze_all_plates(
+        # Límites (r1, c1, r2, c2) de las secciones, compartidos con analyze_this_plate
+        section_limits = self._section_limits()
+        
+        # Realizar análisis completo (el módulo de análisis carga plotly/scipy,
+        # así que se importa solo cuando se usa)
+        from src.analysis import analyze_all_plates
+        # El análisis corre en un hilo sobre una instantánea de máscaras y grises,
+        # así que se pueden seguir editando placas mientras tanto
+        mask_map, neg_ctrl_mask_map = self._freeze_masks()
+        self._start_analysis(functools.partial(
+            analyze_all_plates,
             df=self.df,
-            keys=self.keys,
-            mask_map=self.mask_map,
-            neg_ctrl_mask_map=self.neg_ctrl_mask_map,
-            section_grays=self.section_grays,
+            keys=list(self.keys),
+            mask_map=mask_map,
+            neg_ctrl_mask_map=neg_ctrl_mask_map,
+            section_grays={key: list(grays) for key, grays in self.section_grays.items()},
             sections=section_limits,  # Usar los límites convertidos
-            section_colors=self.section_colors,
+            section_colors=_cycle_palette(self.section_colors, len(section_limits)),
             use_percentage=use_percentage,
             show_error_bars=show_error_bars,
             use_bar_chart=use_bar_chart,
             subtract_neg_ctrl=subtract_neg_ctrl
-        )
+        ), self._show_analysis_report)
+
+    def _show_analysis_report(self, result):
+        """Muestra el resultado de analyze_all y abre el informe HTML."""
+        result_message, html_path = result
         
         # Mostrar mensaje de resultado
-        self.result_box.delete('1.0', ctk.END)
-        self.result_box.insert(ctk.END, result_message)
+        self._set_result(result_message)
         
-        # Abrir el archivo HTML en el navegador predeterminado
+        # Abrir el archivo HTML en el navegador predeterminado; lanzar el navegador
+        # puede tardar, así que se hace en un hilo para no bloquear la interfaz
         if html_path:
-            webbrowser.open('file://' + os.path.abspath(html_path))
+            url = 'file://' + os.path.abspath(html_path)
+            threading.Thread(target=webbrowser.open, args=(url,), daemon=True).start()
 
     def copy_to_assay(self, target_assay):
         """Copia la máscara actual a todas las placas con el mismo ensayo."""
         if not self.selected_key:
             return
             
-        current_mask = self.mask_map[self.selected_key].copy()
-        current_neg_ctrl_mask = self.neg_ctrl_mask_map[self.selected_key].copy()
+        self._share_selected_masks(self._keys_by_assay.get(target_assay, ()))
         
-        for key in self.keys:
-            _, assay = key.split("_")
-            if assay == target_assay:
-                self.mask_map[key] = current_mask.copy()
-                self.neg_ctrl_mask_map[key] = current_neg_ctrl_mask.copy()
+        # La placa visible es el origen de la copia: su contenido no cambia y la
+        # cuadrícula no necesita reconstruirse
         
-        # Refrescar si se está viendo el mismo ensayo
-        if self.selected_key.split("_")[1] == target_assay:
-            self.build_grid()
-        
-        # Guardar máscaras en CSV después de copiar
-        save_masks_to_csv(self.mask_file, self.mask_map)
-        save_neg_ctrl_masks_to_csv(self.neg_ctrl_mask_file, self.neg_ctrl_mask_map)
+        # Guardar máscaras en disco después de copiar
+        self._schedule_mask_flush()
         
         # Mostrar confirmación
-        self.result_box.delete('1.0', ctk.END)
-        self.result_box.insert(ctk.END, f"Selection copied to all plates with assay {target_assay}\n")
+        self._set_result(f"Selection copied to all plates with assay {target_assay}\n")
+
+    def _read_gray_entries(self):
+        """
+        Lee los valores de grises de las entradas de la leyenda.
+        
+        Returns:
+            list: Valor de cada entrada; las entradas no numéricas valen 0.
+        """
+        # Son unas pocas entradas: float() directo es más rápido que pasar por pandas
+        values = []
+        for entry in self.gray_entries:
+            try:
+                values.append(float(entry.get()))
+            except ValueError:
+                values.append(0.0)
+        return values
 
     def save_section_grays(self):
         """Guarda los valores de grises actuales para la placa-ensayo seleccionada."""
         try:
             # Obtener valores de las entradas
-            gray_values = []
-            for entry in self.gray_entries:
-                try:
-                    value = float(entry.get())
-                except ValueError:
-                    value = 0
-                gray_values.append(value)
+            gray_values = self._read_gray_entries()
             
             # Actualizar los valores de grises para la placa-ensayo actual
             self.section_grays[self.selected_key] = gray_values
@@ -946,25 +1255,17 @@ class PlateMaskApp(ctk.CTk):
             save_grays_to_csv(self.gray_file, self.section_grays)
             
             # Mostrar confirmación
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, f"Gray values saved for {self.selected_key}\n")
-            for i, value in enumerate(gray_values):
-                self.result_box.insert(ctk.END, f"Section {i+1}: {value} Grays\n")
+            self._set_result(f"Gray values saved for {self.selected_key}\n" + "".join(
+                f"Section {i+1}: {value} Grays\n" for i, value in enumerate(gray_values)
+            ))
         except Exception as e:
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, f"Error saving gray values: {e}\n")
+            self._set_result(f"Error saving gray values: {e}\n")
 
     def copy_grays_to_all_plates(self):
         """Copia los valores de grises actuales a todas las placas."""
         try:
             # Obtener valores de las entradas
-            gray_values = []
-            for entry in self.gray_entries:
-                try:
-                    value = float(entry.get())
-                except ValueError:
-                    value = 0
-                gray_values.append(value)
+            gray_values = self._read_gray_entries()
             
             # Actualizar todas las placas con estos valores
             for key in self.keys:
@@ -974,49 +1275,61 @@ class PlateMaskApp(ctk.CTk):
             save_grays_to_csv(self.gray_file, self.section_grays)
             
             # Mostrar confirmación
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, "Gray values copied to all plates\n")
-            for i, value in enumerate(gray_values):
-                self.result_box.insert(ctk.END, f"Section {i+1}: {value} Grays\n")
+            self._set_result("Gray values copied to all plates\n" + "".join(
+                f"Section {i+1}: {value} Grays\n" for i, value in enumerate(gray_values)
+            ))
         except Exception as e:
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, f"Error copying gray values: {e}\n")
+            self._set_result(f"Error copying gray values: {e}\n")
+
+    def _sync_plate_data_to_config(self):
+        """
+        Copia las máscaras y grises de todas las placas a la configuración en memoria.
+        
+        Las ediciones solo modifican mask_map/neg_ctrl_mask_map/section_grays; la
+        configuración se actualiza aquí al cerrar o antes de cargar otro archivo.
+        """
+        # Valores por defecto para todas las placas en una sola construcción del dict;
+        # después se sobrescriben con los datos existentes (bulk_update solo copia los que cambian)
+        masks = dict.fromkeys(self.keys, _DEFAULT_MASK)
+        neg_ctrl_masks = dict.fromkeys(self.keys, _DEFAULT_NEG_CTRL_MASK)
+        section_grays = dict.fromkeys(self.keys, [0] * 6)
+        for target, source, name in ((masks, self.mask_map, "mask"),
+                                     (neg_ctrl_masks, self.neg_ctrl_mask_map, "negative control mask"),
+                                     (section_grays, self.section_grays, "section grays")):
+            present = target.keys() & source.keys()
+            target.update((key, source[key]) for key in present)
+            if len(present) < len(target):
+                missing = sorted(target.keys() - present)
+                logger.warning(f"No {name} data found for {missing}, using defaults")
+        
+        # Una sola actualización de la configuración, sin escribir el archivo
+        try:
+            self.config.bulk_update(masks=masks, neg_ctrl_masks=neg_ctrl_masks, section_grays=section_grays)
+        except Exception as e:
+            logger.error(f"Error saving plate data: {str(e)}")
 
     def on_closing(self):
         """Maneja el evento de cierre de la ventana."""
+        # Escribir las máscaras pendientes antes de cerrar
+        if self._mask_flush_after is not None:
+            self.after_cancel(self._mask_flush_after)
+        self._flush_masks()
+        # Esperar a que el hilo de escritura termine las escrituras encoladas
+        self._io_queue.put(None)
+        self._io_thread.join(timeout=5)
+        # Si alguna escritura falló, un último intento directo antes de salir
+        if self._drain_mask_write_results():
+            save_masks_to_npz(self.mask_file, self.mask_map, self.neg_ctrl_mask_map)
+        
         # Save configuration
         if self.df is not None and hasattr(self, 'keys') and self.keys:
-            for key in list(self.keys):  # Create a copy of keys to avoid modification during iteration
-                try:
-                    if key in self.mask_map:
-                        self.config.update_masks(key, self.mask_map[key])
-                    else:
-                        import logging
-                        logging.getLogger('plate_analyzer').warning(f"No mask data found for {key}, using default mask")
-                        self.config.update_masks(key, np.ones((8, 12), dtype=float))
-                    
-                    if key in self.neg_ctrl_mask_map:
-                        self.config.update_neg_ctrl_masks(key, self.neg_ctrl_mask_map[key])
-                    else:
-                        import logging
-                        logging.getLogger('plate_analyzer').warning(f"No negative control mask data found for {key}, using default")
-                        self.config.update_neg_ctrl_masks(key, np.zeros((8, 12), dtype=float))
-                    
-                    if key in self.section_grays:
-                        self.config.update_section_grays(key, self.section_grays[key])
-                    else:
-                        import logging
-                        logging.getLogger('plate_analyzer').warning(f"No section grays data found for {key}, using default")
-                        self.config.update_section_grays(key, [0] * 6)
-                except Exception as e:
-                    import logging
-                    logging.getLogger('plate_analyzer').error(f"Error saving data for {key}: {str(e)}")
+            self._sync_plate_data_to_config()
         
+        # Escribir el archivo solo si algo cambió (placas sincronizadas, archivos recientes...)
         try:
-            self.config.save()
+            self.config.save_if_dirty()
         except Exception as e:
-            import logging
-            logging.getLogger('plate_analyzer').error(f"Error saving configuration: {str(e)}")
+            logger.error(f"Error saving configuration: {str(e)}")
         
         # Destroy the window
         self.destroy()
@@ -1026,22 +1339,23 @@ class PlateMaskApp(ctk.CTk):
         if not self.selected_key:
             return
         
-        # Update the value in the section_grays dictionary
+        # Update the value in the section_grays dictionary; the configuration is
+        # synced on close (_sync_plate_data_to_config)
         self.section_grays[self.selected_key][index] = value
         
-        # Update the configuration
-        self.config.update_section_grays(self.selected_key, self.section_grays[self.selected_key])
-        
         # No need to rebuild the grid, just update the internal data
     
     def load_file(self, df, file_path):
         """Load a new file and initialize the application with it."""
         try:
             if df is None or df.empty:
-                self.result_box.delete('1.0', ctk.END)
-                self.result_box.insert(ctk.END, f"Error: No data found in file {file_path}\n")
+                self._set_result(f"Error: No data found in file {file_path}\n")
                 return
                 
+            # Conservar en la configuración las ediciones del archivo actual
+            if self.keys:
+                self._sync_plate_data_to_config()
+            
             # Store the new DataFrame and file path
             self.df = df
             self.current_file_path = file_path
@@ -1050,8 +1364,7 @@ class PlateMaskApp(ctk.CTk):
             self._initialize_data(df)
             
             if not self.keys:
-                self.result_box.delete('1.0', ctk.END)
-                self.result_box.insert(ctk.END, f"Error: No valid plate-assay combinations found in {file_path}\n")
+                self._set_result(f"Error: No valid plate-assay combinations found in {file_path}\n")
                 return
             
             # Update the combo box with new keys
@@ -1071,29 +1384,36 @@ class PlateMaskApp(ctk.CTk):
             self.build_grid()
             
             # Show confirmation
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, f"Successfully loaded file: {file_path}\n")
-            self.result_box.insert(ctk.END, f"Found {len(self.keys)} plate-assay combinations\n")
+            self._set_result(
+                f"Successfully loaded file: {file_path}\n"
+                f"Found {len(self.keys)} plate-assay combinations\n"
+            )
             
         except Exception as e:
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, f"Error loading file {file_path}: {str(e)}\n")
-            import traceback
-            self.result_box.insert(ctk.END, f"Traceback: {traceback.format_exc()}\n")
+            self._set_result(
+                f"Error loading file {file_path}: {str(e)}\n"
+                f"Traceback: {traceback.format_exc()}\n"
+            )
 
     def analyze_this_plate(self):
         """Analyze current plate and show section summary table."""
         # Analyze only this plate using full analysis pipeline
         if not self.selected_key:
             return
-        plate, assay = self.selected_key.split("_")
+        plate, assay = self._key_parts[self.selected_key]
+        # Máscaras de solo lectura: el análisis corre en otro hilo y un clic
+        # posterior trabaja sobre su propia copia (_writable_mask)
         mask = self.mask_map[self.selected_key]
+        mask.flags.writeable = False
         neg_ctrl_mask = self.neg_ctrl_mask_map[self.selected_key]
-        sections = self.grid_sections
+        neg_ctrl_mask.flags.writeable = False
+        sections = self._section_limits()
         use_percentage = self.percent_var.get()
         subtract_neg_ctrl = self.subtract_neg_ctrl_var.get()
 
-        result_text = analyze_plate(
+        from src.analysis import analyze_plate
+        self._start_analysis(functools.partial(
+            analyze_plate,
             self.df,
             plate,
             assay,
@@ -1103,22 +1423,72 @@ class PlateMaskApp(ctk.CTk):
             use_percentage,
             subtract_neg_ctrl,
             getattr(self, 'current_individual_plate', None)
-        )
+        ), self._show_plate_analysis)
 
+    def _show_plate_analysis(self, result_text):
+        """Muestra el resultado de analyze_this_plate."""
         # Show in result box
-        self.result_box.delete('1.0', ctk.END)
-        self.result_box.insert(tk.END, result_text)
+        self._set_result(result_text)
+
+    def _start_analysis(self, analysis, on_done):
+        """
+        Run an analysis in a background thread and hand its result to on_done.
+        
+        The analysis buttons are disabled until it finishes, so only one analysis
+        runs at a time.
+        
+        Args:
+            analysis (callable): Analysis to run, without arguments.
+            on_done (callable): Called on the UI thread with the analysis result.
+        """
+        if self._analysis_thread is not None:
+            return
+        self.start_btn.configure(state=tk.DISABLED)
+        self.analyze_all_btn.configure(state=tk.DISABLED)
+        self._set_result("Analyzing...\n")
+        
+        def run():
+            try:
+                self._analysis_results.put((on_done, analysis(), None))
+            except Exception:
+                self._analysis_results.put((on_done, None, traceback.format_exc()))
+        
+        self._analysis_thread = threading.Thread(target=run, daemon=True)
+        self._analysis_thread.start()
+        self.after(100, self._poll_analysis)
+
+    def _poll_analysis(self):
+        """Comprueba si el análisis en curso ha terminado y muestra su resultado."""
+        try:
+            on_done, result, error = self._analysis_results.get_nowait()
+        except queue.Empty:
+            # Tkinter no es seguro entre hilos: el resultado se recoge desde el bucle de eventos
+            self.after(100, self._poll_analysis)
+            return
+        
+        self._analysis_thread = None
+        if self.df is not None:
+            self.start_btn.configure(state=tk.NORMAL)
+            self.analyze_all_btn.configure(state=tk.NORMAL)
+        
+        if error is not None:
+            logger.error(f"Error during analysis: {error}")
+            self._set_result(f"Error during analysis:\n{error}\n")
+            return
+        on_done(result)
 
     def save_to_db_action(self):
         """Prepare current data and save it to the SQLite DB, resolving duplicates and conflicts through dialogs."""
         if self.df is None or not hasattr(self, 'current_file_path'):
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, "Please load a data file first.")
+            self._set_result("Please load a data file first.")
             return
 
         try:
-            self.result_box.delete('1.0', ctk.END)
-            self.result_box.insert(ctk.END, "Preparing data for database...\n")
+            import pandas as pd
+            from src.modules.database import find_conflicts, insert_records, replace_records
+            from src.ui.conflict_dialog import ConflictDialog
+            
+            self._set_result("Preparing data for database...\n")
             self.update_idletasks()
 
             # --- 1. Extract date from file name or modification time ---
@@ -1132,12 +1502,13 @@ class PlateMaskApp(ctk.CTk):
 
             # --- 2. Build records list ---
             records = []
-            well_to_section = {well: i for i, section in enumerate(self.section_wells) for well in section}
+            self._section_geometry()
+            well_section_index = self._well_section_index
 
             for key in self.keys:
-                plate_no, assay = key.split('_')
-                mask = self.mask_map.get(key, np.ones((8, 12)))
-                neg_ctrl_mask = self.neg_ctrl_mask_map.get(key, np.zeros((8, 12)))
+                plate_no, assay = self._key_parts[key]
+                mask = self.mask_map.get(key, _DEFAULT_MASK)
+                neg_ctrl_mask = self.neg_ctrl_mask_map.get(key, _DEFAULT_NEG_CTRL_MASK)
                 section_doses = self.section_grays.get(key, [0] * len(self.section_wells))
 
                 plate_rows = self.df[(self.df['plate_no'] == plate_no) & (self.df['assay'] == assay)]
@@ -1151,7 +1522,7 @@ class PlateMaskApp(ctk.CTk):
                                 continue
                             well_name = f"{j + 1}{chr(ord('A') + i)}"
                             is_neg_control = int(neg_ctrl_mask[i, j] == 1)
-                            section_index = well_to_section.get((i, j), -1)
+                            section_index = int(well_section_index[i, j])
                             dose = section_doses[section_index] if section_index != -1 else 0
                             records.append({
                                 'file_path': self.current_file_path,
@@ -1192,9 +1563,8 @@ class PlateMaskApp(ctk.CTk):
                 )
             else:
                 # Show conflicts dialog (side-by-side)
-                import logging
-                logging.getLogger('plate_analyzer').info('DB Conflicts DF (from DB): ' + str(len(db_conflicts_df)))
-                logging.getLogger('plate_analyzer').info('Incoming Conflicts DF (from file): ' + str(len(incoming_conflicts_df)))
+                logger.info('DB Conflicts DF (from DB): ' + str(len(db_conflicts_df)))
+                logger.info('Incoming Conflicts DF (from file): ' + str(len(incoming_conflicts_df)))
                 conflict_dialog = ConflictDialog(self, db_conflicts_df, incoming_conflicts_df)
                 user_choice = conflict_dialog.result
                 if user_choice == 'replace':
@@ -1214,14 +1584,16 @@ class PlateMaskApp(ctk.CTk):
                     self.result_box.insert(ctk.END, "Save cancelled.\n")
 
         except Exception as e:
-            import traceback
-            logging.getLogger('plate_analyzer').error(f"Error in save_to_db_action: {e}")
+            logger.error(f"Error in save_to_db_action: {e}")
             self.result_box.insert(ctk.END, f"An error occurred: {e}\n")
             self.result_box.insert(ctk.END, traceback.format_exc())
 
     def export_to_graphpad_xml_action(self):
         """Handles the logic to export the entire database to a GraphPad XML file."""
         try:
+            from src.modules import exporter
+            from src.modules.database import get_all_records_as_df
+            
             self.result_box.insert(ctk.END, "Exporting database to GraphPad XML...\n")
             
             # 1. Fetch data from DB
@@ -1249,7 +1621,6 @@ class PlateMaskApp(ctk.CTk):
             self.result_box.insert(ctk.END, f"Database successfully exported to {file_path}\n")
 
         except Exception as e:
-            import traceback
-            logging.getLogger('plate_analyzer').error(f"Error during GraphPad XML export: {e}")
+            logger.error(f"Error during GraphPad XML export: {e}")
             messagebox.showerror("Export Error", f"An error occurred during export: {e}")
             self.result_box.insert(ctk.END, f"An error occurred during export: {e}\n{traceback.format_exc()}\n")
\ No newline at end of file
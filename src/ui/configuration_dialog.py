@@ -2,7 +2,6 @@
 Configuration dialog for the Plates Analyzer application.
 """
 import customtkinter as ctk
-from src.modules import database as db
 from tkinter import ttk, messagebox
 
 class ConfigurationDialog(ctk.CTkToplevel):
@@ -109,6 +108,7 @@ class ConfigurationDialog(ctk.CTkToplevel):
         """Prompt confirmation and delete all records from the database."""
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete ALL records from the database? This action cannot be undone."):
             try:
+                from src.modules import database as db
                 db.delete_all_records()
                 messagebox.showinfo("Success", "All records have been deleted from the database.")
             except Exception as e:
@@ -1,5 +1,4 @@
 import customtkinter as ctk
-import pandas as pd
 
 class ConflictDialog(ctk.CTkToplevel):
     """Dialog to display conflicting records: DB vs Incoming."""
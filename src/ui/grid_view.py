@@ -1,17 +1,55 @@
 """
 Módulo para la visualización de la cuadrícula de placas.
 """
+import tkinter as tk
 import customtkinter as ctk
+import numpy as np
+
+# Geometría de la cuadrícula dibujada en el canvas (píxeles)
+CELL_WIDTH = 44
+CELL_HEIGHT = 34
+CELL_PADDING = 2
+ROW_HEADER_WIDTH = 30
+COLUMN_HEADER_HEIGHT = 26
+
+# Colores de los pocillos
+NEG_CTRL_COLOR = '#800080'  # Púrpura para control negativo
+EXCLUDED_COLOR = '#ff0000'  # Rojo para pocillo excluido
+
+
+def _mode_color(color):
+    """
+    Resolve a CustomTkinter theme color for the current appearance mode.
+
+    Args:
+        color (str or list): Single color or (light, dark) pair.
+
+    Returns:
+        str: Color for the current appearance mode.
+    """
+    if isinstance(color, (list, tuple)):
+        return color[1] if ctk.get_appearance_mode() == "Dark" else color[0]
+    return color
+
 
 class PlateGridView:
     """Class to display the well grid of a plate."""
-    
-    def __init__(self, parent, plate, assay, mask, neg_ctrl_mask, sections, section_colors, 
-                toggle_well_callback, toggle_negative_control_callback, advanced_mode=False, 
+
+    # Estilo de cada pocillo indexado por su código incluido + 2 * control negativo:
+    # (relleno, borde, grosor de borde, color del texto). None = color de texto del tema
+    _WELL_STYLE = (
+        (EXCLUDED_COLOR, EXCLUDED_COLOR, 1, "white"),    # 0: Pocillo excluido - rojo
+        ("", None, 1, None),                             # 1: Pocillo normal - sin relleno
+        (NEG_CTRL_COLOR, EXCLUDED_COLOR, 2, "white"),    # 2: Ambos - púrpura con borde rojo
+        (NEG_CTRL_COLOR, NEG_CTRL_COLOR, 1, "white"),    # 3: Control negativo - púrpura
+    )
+
+    def __init__(self, parent, plate, assay, mask, neg_ctrl_mask, sections, section_colors,
+                toggle_well_callback, toggle_negative_control_callback, advanced_mode=False,
                 current_individual_plate=None):
         """
         Initialize the grid view.
-        
+
         Args:
             parent: Parent widget where the grid will be displayed.
             plate (str): Plate number.
@@ -36,126 +74,242 @@ class PlateGridView:
         self.toggle_negative_control_callback = toggle_negative_control_callback
         self.advanced_mode = advanced_mode
         self.current_individual_plate = current_individual_plate
-        
-        self.buttons = []
-        self.all_buttons = {}
-        
+
+        # Ids de los rectángulos de cada pocillo en el canvas, [fila][columna]
+        self.well_ids = []
+        # Último estado dibujado de cada pocillo (incluido + 2 * control negativo);
+        # -1 obliga a redibujarlo. Permite reconfigurar solo los pocillos que cambian
+        self._well_codes = np.full((8, 12), -1, dtype=np.int8)
+        # Secciones y colores dibujados por última vez; si no cambian no se redibujan
+        self._drawn_sections = None
+
         self._create_grid()
-    
+
     def _create_grid(self):
-        """Create the well grid."""
+        """Create the grid widgets: the title label and the canvas."""
+        self.plate_label = ctk.CTkLabel(self.parent, text="", font=("Arial", 14, "bold"))
+
+        # Toda la cuadrícula se dibuja en un único canvas en lugar de 96 botones
+        self.canvas = tk.Canvas(
+            self.parent,
+            width=ROW_HEADER_WIDTH + 12 * CELL_WIDTH + CELL_PADDING,
+            height=COLUMN_HEADER_HEIGHT + 8 * CELL_HEIGHT + CELL_PADDING,
+            highlightthickness=0
+        )
+
+        # Clic izquierdo: excluir/incluir pocillo; clic derecho: control negativo
+        self.canvas.bind("<Button-1>", self._on_left_click)
+        self.canvas.bind("<Button-3>", self._on_right_click)
+
+        self.show()
+        self._draw()
+
+    def _title(self):
+        """Return the title shown above the grid."""
         # If in advanced mode and an individual plate is selected, use that data
         if self.advanced_mode and self.current_individual_plate is not None:
             # Show the individual plate
             hours = self.current_individual_plate['hours']
-            plate_label = ctk.CTkLabel(self.parent, 
-                                      text=f"Viewing: {self.plate}_{self.assay} at {hours} hours",
-                                      font=("Arial", 14, "bold"))
-            plate_label.grid(row=0, column=0, columnspan=13, pady=(0, 10))
-            
-            # Set initial row for the grid
-            start_row = 1
+            return f"Viewing: {self.plate}_{self.assay} at {hours} hours"
+        # Regular mode - just show the plate-assay
+        return f"Viewing: {self.plate}_{self.assay}"
+
+    def _draw(self):
+        """Draw the title, sections and well colors, reusing the canvas items already created."""
+        self.plate_label.configure(text=self._title())
+
+        # Colores del tema actual (el modo claro/oscuro puede cambiar entre dibujos)
+        self._text_color = _mode_color(ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+        self.canvas.configure(bg=_mode_color(ctk.ThemeManager.theme["CTk"]["fg_color"]))
+
+        # El color del tema puede haber cambiado: volver a aplicar el estilo a todos los pocillos
+        self._well_codes.fill(-1)
+
+        # Cabeceras y pocillos se crean una sola vez; en los siguientes dibujos solo se recolorean
+        if not self.well_ids:
+            self._create_cells()
         else:
-            # Regular mode - just show the plate-assay
-            plate_label = ctk.CTkLabel(self.parent, 
-                                      text=f"Viewing: {self.plate}_{self.assay}",
-                                      font=("Arial", 14, "bold"))
-            plate_label.grid(row=0, column=0, columnspan=13, pady=(0, 10))
-            start_row = 1
+            self.canvas.itemconfigure("header", fill=self._text_color)
 
+        sections_key = (tuple(self.sections), tuple(self.section_colors))
+        if sections_key != self._drawn_sections:
+            self._draw_sections()
+            self._drawn_sections = sections_key
+        self.refresh(self.mask, self.neg_ctrl_mask)
+
+    def _create_cells(self):
+        """Create the header texts and the 96 well items of the canvas."""
         # Add column headers (1-12)
         for j in range(12):
-            col_label = ctk.CTkLabel(self.parent, text=f"{j+1}")
-            col_label.grid(row=start_row, column=j+1, padx=2, pady=2)
-            
-        # Create section frames first
-        section_frames = []
-        for i, (r1, c1, r2, c2) in enumerate(self.sections):
-            # Create a frame for this section with a colored border
-            section_frame = ctk.CTkFrame(self.parent, fg_color="transparent", 
-                                        border_color=self.section_colors[i], border_width=2)
-            # Position the frame to cover the wells in this section
-            section_frame.grid(row=r1+start_row+1, column=c1+1, rowspan=r2-r1+1, 
-                              columnspan=c2-c1+1, padx=2, pady=2, sticky="nsew")
-            
-            # Add a label for the section
-            section_label = ctk.CTkLabel(section_frame, text=f"S{i+1}", 
-                                        fg_color=self.section_colors[i],
-                                        text_color="black", corner_radius=5)
-            section_label.place(x=5, y=5)
-            
-            section_frames.append(section_frame)
-        
-        # Add row headers (A-H) and buttons
+            self.canvas.create_text(ROW_HEADER_WIDTH + (j + 0.5) * CELL_WIDTH, COLUMN_HEADER_HEIGHT / 2,
+                                    text=f"{j+1}", fill=self._text_color, font=("Arial", 12),
+                                    tags=("header",))
+
+        # Add row headers (A-H)
+        for i in range(8):
+            self.canvas.create_text(ROW_HEADER_WIDTH - 8, COLUMN_HEADER_HEIGHT + (i + 0.5) * CELL_HEIGHT,
+                                    text=chr(ord('A') + i), anchor="e", fill=self._text_color,
+                                    font=("Arial", 12), tags=("header",))
+
+        # Add wells (1A, 2A, etc.)
         for i in range(8):  # filas A-H
-            row_btns = []
-            # Encabezado de fila
-            row_label = ctk.CTkLabel(self.parent, text=f"{chr(ord('A')+i)}")
-            row_label.grid(row=i+start_row+1, column=0, padx=(0, 5), sticky="e")
-            
+            row_ids = []
             for j in range(12):  # columnas 1-12
-                # Crear etiqueta de pocillo (1A, 2A, etc.)
-                well_label = f"{j+1}{chr(ord('A')+i)}"
-                
-                # Determinar a qué sección pertenece este pocillo
-                section_idx = -1
-                for idx, (r1, c1, r2, c2) in enumerate(self.sections):
-                    if r1 <= i <= r2 and c1 <= j <= c2:
-                        section_idx = idx
-                        break
-                
-                # Determinar color del botón basado en máscara y estado de control negativo
-                if self.neg_ctrl_mask[i,j] == 1 and self.mask[i,j] == 0:
-                    # Ambos control negativo y excluido - púrpura con borde rojo
-                    btn = ctk.CTkButton(
-                        self.parent,
-                        text=well_label,
-                        width=40,
-                        height=30,
-                        fg_color='#800080',  # Púrpura para control negativo
-                        border_color='#ff0000',
-                        border_width=2,
-                        command=lambda x=i, y=j: self.toggle_well_callback(x, y)
-                    )
-                elif self.neg_ctrl_mask[i,j] == 1:
-                    # Control negativo - púrpura
-                    btn = ctk.CTkButton(
-                        self.parent,
-                        text=well_label,
-                        width=40,
-                        height=30,
-                        fg_color='#800080',  # Púrpura para control negativo
-                        command=lambda x=i, y=j: self.toggle_well_callback(x, y)
-                    )
-                elif self.mask[i,j] == 0:
-                    # Pocillo excluido - rojo
-                    btn = ctk.CTkButton(
-                        self.parent,
-                        text=well_label,
-                        width=40,
-                        height=30,
-                        fg_color='#ff0000',
-                        command=lambda x=i, y=j: self.toggle_well_callback(x, y)
-                    )
-                else:
-                    # Pocillo normal - por defecto
-                    btn = ctk.CTkButton(
-                        self.parent,
-                        text=well_label,
-                        width=40,
-                        height=30,
-                        fg_color='transparent',
-                        command=lambda x=i, y=j: self.toggle_well_callback(x, y)
-                    )
-                btn.grid(row=i+start_row+1, column=j+1, padx=2, pady=2)
-                
-                # Vincular clic derecho para marcar como control negativo
-                btn.bind("<Button-3>", lambda event, x=i, y=j: self.toggle_negative_control_callback(x, y))
-                
-                row_btns.append(btn)
-            self.buttons.append(row_btns)
-        
-        # Almacenar referencias a todos los botones para acceso rápido
-        for i in range(8):
-            for j in range(12):
-                self.all_buttons[(i, j)] = self.buttons[i][j]
+                x0, y0 = self._cell_origin(i, j)
+                well_id = self.canvas.create_rectangle(
+                    x0 + CELL_PADDING, y0 + CELL_PADDING,
+                    x0 + CELL_WIDTH - CELL_PADDING, y0 + CELL_HEIGHT - CELL_PADDING
+                )
+                self.canvas.create_text(x0 + CELL_WIDTH / 2, y0 + CELL_HEIGHT / 2,
+                                        text=f"{j+1}{chr(ord('A')+i)}", tags=(f"label_{i}_{j}",),
+                                        font=("Arial", 11))
+                row_ids.append(well_id)
+            self.well_ids.append(row_ids)
+
+    def _draw_sections(self):
+        """Replace the section borders and labels of the canvas."""
+        self.canvas.delete("section")
+
+        # Section borders below the wells
+        for i, (r1, c1, r2, c2) in enumerate(self.sections):
+            x0, y0 = self._cell_origin(r1, c1)
+            x1, y1 = self._cell_origin(r2 + 1, c2 + 1)
+            self.canvas.create_rectangle(x0 + 1, y0 + 1, x1 + 1, y1 + 1,
+                                         outline=self.section_colors[i], width=2,
+                                         tags=("section", "section_border"))
+        self.canvas.tag_lower("section_border")
+
+        # Section labels on top of their first well
+        for i, (r1, c1, r2, c2) in enumerate(self.sections):
+            x0, y0 = self._cell_origin(r1, c1)
+            self.canvas.create_text(x0 + 6, y0 + 4, text=f"S{i+1}", anchor="nw",
+                                    fill=self.section_colors[i], font=("Arial", 8, "bold"),
+                                    tags=("section",))
+
+    def update(self, plate, assay, mask, neg_ctrl_mask, sections, section_colors, advanced_mode=False,
+               current_individual_plate=None):
+        """
+        Redraw the grid for new data, reusing the existing label, canvas and well items.
+
+        Args:
+            plate (str): Plate number.
+            assay (str): Assay type.
+            mask (numpy.ndarray): Well mask (8x12).
+            neg_ctrl_mask (numpy.ndarray): Negative control mask (8x12).
+            sections (list): List of tuples with the limits of each section.
+            section_colors (list): List of colors for each section.
+            advanced_mode (bool, optional): Whether it is in advanced mode. Defaults to False.
+            current_individual_plate (pandas.Series, optional): Data of the selected individual plate.
+        """
+        self.plate = plate
+        self.assay = assay
+        self.mask = mask
+        self.neg_ctrl_mask = neg_ctrl_mask
+        self.sections = sections
+        self.section_colors = section_colors
+        self.advanced_mode = advanced_mode
+        self.current_individual_plate = current_individual_plate
+        self.show()
+        self._draw()
+
+    def show(self):
+        """Place the grid widgets in the parent."""
+        self.plate_label.grid(row=0, column=0, pady=(0, 10))
+        self.canvas.grid(row=1, column=0)
+
+    def hide(self):
+        """Remove the grid widgets from the parent without destroying them."""
+        self.plate_label.grid_forget()
+        self.canvas.grid_forget()
+
+    def _cell_origin(self, i, j):
+        """Return the canvas coordinates of the top-left corner of well (i, j)."""
+        return ROW_HEADER_WIDTH + j * CELL_WIDTH, COLUMN_HEADER_HEIGHT + i * CELL_HEIGHT
+
+    def _event_to_well(self, event):
+        """
+        Convert a mouse event on the canvas into a well position.
+
+        Args:
+            event (tkinter.Event): Mouse event.
+
+        Returns:
+            tuple: (row, column) of the well, or None if the click is outside the wells.
+        """
+        x = self.canvas.canvasx(event.x) - ROW_HEADER_WIDTH
+        y = self.canvas.canvasy(event.y) - COLUMN_HEADER_HEIGHT
+        if x < 0 or y < 0:
+            return None
+        i, j = int(y // CELL_HEIGHT), int(x // CELL_WIDTH)
+        if i < 8 and j < 12:
+            return i, j
+        return None
+
+    def _on_left_click(self, event):
+        """Toggle the mask of the clicked well."""
+        well = self._event_to_well(event)
+        if well is not None:
+            self.toggle_well_callback(*well)
+
+    def _on_right_click(self, event):
+        """Toggle the negative control state of the clicked well."""
+        well = self._event_to_well(event)
+        if well is not None:
+            self.toggle_negative_control_callback(*well)
+
+    def update_well(self, i, j, mask_value, neg_ctrl_value):
+        """
+        Recolor a single well from its mask and negative control values.
+
+        Args:
+            i (int): Row of the well.
+            j (int): Column of the well.
+            mask_value (float): Value of the well mask (0 = excluded).
+            neg_ctrl_value (float): Value of the negative control mask (1 = negative control).
+        """
+        # Determinar estilo del pocillo basado en máscara y estado de control negativo
+        self._apply_well_code(i, j, (mask_value != 0) + 2 * (neg_ctrl_value == 1))
+
+    def _apply_well_code(self, i, j, code):
+        """Recolor a single well from its style code, skipping it if already drawn that way."""
+        if self._well_codes[i, j] == code:
+            return
+        self._well_codes[i, j] = code
+        fill, outline, width, text_color = self._WELL_STYLE[code]
+        self.canvas.itemconfigure(self.well_ids[i][j], fill=fill, outline=outline or self._text_color,
+                                  width=width)
+        self.canvas.itemconfigure(f"label_{i}_{j}", fill=text_color or self._text_color)
+
+    def set_plate(self, plate, assay, mask, neg_ctrl_mask):
+        """
+        Show another plate-assay on the existing grid.
+
+        The sections are the same for every plate-assay, so only the title and
+        the well colors change.
+
+        Args:
+            plate (str): Plate number.
+            assay (str): Assay type.
+            mask (numpy.ndarray): Well mask (8x12).
+            neg_ctrl_mask (numpy.ndarray): Negative control mask (8x12).
+        """
+        self.plate = plate
+        self.assay = assay
+        self.current_individual_plate = None
+        self.plate_label.configure(text=self._title())
+        self.refresh(mask, neg_ctrl_mask)
+
+    def refresh(self, mask, neg_ctrl_mask):
+        """
+        Recolor the wells whose state differs from the drawn one.
+
+        Args:
+            mask (numpy.ndarray): Well mask (8x12).
+            neg_ctrl_mask (numpy.ndarray): Negative control mask (8x12).
+        """
+        self.mask = mask
+        self.neg_ctrl_mask = neg_ctrl_mask
+        # Comparar todos los pocillos de una vez y reconfigurar solo los que cambian
+        codes = (np.asarray(mask) != 0) + 2 * (np.asarray(neg_ctrl_mask) == 1)
+        for i, j in np.argwhere(codes != self._well_codes).tolist():
+            self._apply_well_code(i, j, int(codes[i, j]))
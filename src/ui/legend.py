@@ -1,6 +1,7 @@
 """
 Legend module for the Plates Analyzer application.
 """
+import tkinter as tk
 import customtkinter as ctk
 
 class SectionLegend(ctk.CTkFrame):
@@ -16,72 +17,115 @@ class SectionLegend(ctk.CTkFrame):
             save_callback: Callback for saving gray values.
             copy_callback: Callback for copying gray values to all plates.
         """
-        import logging
-        logging.getLogger('plate_analyzer').debug(f"DEBUG PRE-super: id(self)={id(self)}, Class id={id(SectionLegend)}")
         super().__init__(parent)
-        logging.getLogger('plate_analyzer').debug(f"DEBUG POST-super: 'pack' in dir(self)? {'pack' in dir(self)}")
         self.section_colors = section_colors
         self.section_grays = section_grays
         self.save_callback = save_callback
         self.copy_callback = copy_callback
         self.gray_entries = []
         
-        # Get section units from config
-        self.section_units = getattr(parent.master.master, 'config', None)
-        if self.section_units:
-            self.section_units = getattr(self.section_units, 'section_units', "grays")
-        else:
-            self.section_units = "grays"
+        self._rows = []  # Filas de sección reutilizables (frame, color, entrada, unidades)
         
         self._create_legend()
     
+    def _read_section_units(self):
+        """Return the section units from the application config."""
+        config = getattr(self.master.master.master, 'config', None)
+        if config:
+            return getattr(config, 'section_units', "grays")
+        return "grays"
+    
     def _create_legend(self):
         """Create the legend UI."""
         # Title
         title = ctk.CTkLabel(self, text="Section Legend", font=("Arial", 14, "bold"))
         title.pack(pady=(0, 10))
         
-        # Create a row for each section
-        num_sections = len(self.section_grays)
-        
-        for i in range(num_sections):
-            row_frame = ctk.CTkFrame(self)
-            row_frame.pack(fill="x", pady=2)
-            
-            # Color indicator
-            color_frame = ctk.CTkFrame(row_frame, fg_color=self.section_colors[i % len(self.section_colors)], width=20, height=20, corner_radius=0)
-            color_frame.pack(side="left", padx=5)
-            
-            # Section label
-            section_label = ctk.CTkLabel(row_frame, text=f"S{i+1}")
-            section_label.pack(side="left", padx=5)
-            
-            # Gray value entry
-            gray_entry = ctk.CTkEntry(row_frame, width=60, placeholder_text="0")
-            gray_entry.pack(side="left", padx=5)
-            self.gray_entries.append(gray_entry)
-            
-            # Units label
-            units_label = ctk.CTkLabel(row_frame, text=self.section_units)
-            units_label.pack(side="left", padx=5)
-            
-            # Add callback to update when entry changes
-            gray_entry.bind("<FocusOut>", lambda event, idx=i, entry=gray_entry: self._on_entry_change(idx, entry))
-            gray_entry.bind("<Return>", lambda event, idx=i, entry=gray_entry: self._on_entry_change(idx, entry))
-        
         # Add buttons at the bottom
-        button_frame = ctk.CTkFrame(self)
-        button_frame.pack(fill="x", pady=(10, 0))
+        self.button_frame = ctk.CTkFrame(self)
+        self.button_frame.pack(fill="x", pady=(10, 0))
         
         if self.copy_callback:
             copy_btn = ctk.CTkButton(
-                button_frame, 
+                self.button_frame, 
                 text="Copy to All Plates", 
                 command=self.copy_callback,
                 fg_color="#4CAF50",
                 hover_color="#45a049"
             )
             copy_btn.pack(pady=5)
+        
+        self.set_sections(self.section_colors, self.section_grays)
+    
+    def _create_row(self, i):
+        """Create the widgets of the legend row for section i.
+        
+        Args:
+            i: Index of the section.
+            
+        Returns:
+            dict: Widgets of the row.
+        """
+        row_frame = ctk.CTkFrame(self)
+        
+        # Color indicator
+        color_frame = ctk.CTkFrame(row_frame, width=20, height=20, corner_radius=0)
+        color_frame.pack(side="left", padx=5)
+        
+        # Section label
+        section_label = ctk.CTkLabel(row_frame, text=f"S{i+1}")
+        section_label.pack(side="left", padx=5)
+        
+        # Gray value entry
+        gray_entry = ctk.CTkEntry(row_frame, width=60, placeholder_text="0")
+        gray_entry.pack(side="left", padx=5)
+        
+        # Units label
+        units_label = ctk.CTkLabel(row_frame)
+        units_label.pack(side="left", padx=5)
+        
+        # Add callback to update when entry changes
+        gray_entry.bind("<FocusOut>", lambda event, idx=i, entry=gray_entry: self._on_entry_change(idx, entry))
+        gray_entry.bind("<Return>", lambda event, idx=i, entry=gray_entry: self._on_entry_change(idx, entry))
+        
+        return {'frame': row_frame, 'color': color_frame, 'entry': gray_entry, 'units': units_label}
+    
+    def set_sections(self, section_colors, section_grays):
+        """Show a row for each section, reusing the rows already created.
+        
+        Args:
+            section_colors: List of colors for each section.
+            section_grays: List of gray values for each section.
+        """
+        self.section_colors = section_colors
+        self.section_grays = section_grays
+        self.section_units = self._read_section_units()
+        
+        # Create a row for each section
+        num_sections = len(section_grays)
+        while len(self._rows) < num_sections:
+            self._rows.append(self._create_row(len(self._rows)))
+        
+        for i, row in enumerate(self._rows):
+            if i < num_sections:
+                row['color'].configure(fg_color=section_colors[i % len(section_colors)])
+                row['units'].configure(text=self.section_units)
+                row['entry'].delete(0, ctk.END)
+                row['frame'].pack(fill="x", pady=2, before=self.button_frame)
+            else:
+                row['frame'].pack_forget()
+        
+        self.gray_entries = [row['entry'] for row in self._rows[:num_sections]]
+    
+    def set_section_grays(self, section_grays):
+        """Show the gray values of another plate-assay in the existing rows.
+        
+        Args:
+            section_grays: List of gray values for each section.
+        """
+        self.section_grays = section_grays
+        for entry in self.gray_entries:
+            entry.delete(0, ctk.END)
     
     def _on_entry_change(self, index, entry):
         """Handle entry value change.
@@ -102,6 +146,16 @@ class SectionLegend(ctk.CTkFrame):
 class WellStatusLegend(ctk.CTkFrame):
     """Legend for well status."""
     
+    # (texto, relleno, borde, grosor del borde) de cada estado de pocillo
+    STATUSES = [
+        ("Normal Well", "", "gray", 1),
+        ("Excluded Well", "#ff0000", "#ff0000", 1),
+        ("Negative Control", "#800080", "#800080", 1),
+        ("Excluded Neg. Control", "#800080", "#ff0000", 2),
+    ]
+    ROW_HEIGHT = 26
+    TITLE_HEIGHT = 40
+    
     def __init__(self, parent):
         """Initialize the well status legend.
         
@@ -112,47 +166,39 @@ class WellStatusLegend(ctk.CTkFrame):
         self._create_legend()
     
     def _create_legend(self):
-        """Create the legend UI."""
-        # Title
-        title = ctk.CTkLabel(self, text="Well Status", font=("Arial", 14, "bold"))
-        title.pack(pady=(10, 10))
-        
-        # Normal well
-        normal_frame = ctk.CTkFrame(self)
-        normal_frame.pack(fill="x", pady=2)
+        """Create the legend UI as a single canvas instead of a frame and labels per status."""
+        self.canvas = tk.Canvas(
+            self,
+            width=200,
+            height=self.TITLE_HEIGHT + len(self.STATUSES) * self.ROW_HEIGHT,
+            highlightthickness=0
+        )
+        self.canvas.pack(fill="x")
         
-        normal_indicator = ctk.CTkFrame(normal_frame, fg_color="transparent", width=20, height=20, corner_radius=0, border_width=1, border_color="gray")
-        normal_indicator.pack(side="left", padx=5)
-        
-        normal_label = ctk.CTkLabel(normal_frame, text="Normal Well")
-        normal_label.pack(side="left", padx=5)
-        
-        # Excluded well
-        excluded_frame = ctk.CTkFrame(self)
-        excluded_frame.pack(fill="x", pady=2)
-        
-        excluded_indicator = ctk.CTkFrame(excluded_frame, fg_color="#ff0000", width=20, height=20, corner_radius=0)
-        excluded_indicator.pack(side="left", padx=5)
-        
-        excluded_label = ctk.CTkLabel(excluded_frame, text="Excluded Well")
-        excluded_label.pack(side="left", padx=5)
-        
-        # Negative control
-        neg_ctrl_frame = ctk.CTkFrame(self)
-        neg_ctrl_frame.pack(fill="x", pady=2)
-        
-        neg_ctrl_indicator = ctk.CTkFrame(neg_ctrl_frame, fg_color="#800080", width=20, height=20, corner_radius=0)
-        neg_ctrl_indicator.pack(side="left", padx=5)
-        
-        neg_ctrl_label = ctk.CTkLabel(neg_ctrl_frame, text="Negative Control")
-        neg_ctrl_label.pack(side="left", padx=5)
-        
-        # Excluded negative control
-        excluded_neg_frame = ctk.CTkFrame(self)
-        excluded_neg_frame.pack(fill="x", pady=2)
-        
-        excluded_neg_indicator = ctk.CTkFrame(excluded_neg_frame, fg_color="#800080", width=20, height=20, corner_radius=0, border_width=2, border_color="#ff0000")
-        excluded_neg_indicator.pack(side="left", padx=5)
+        # Title
+        self._text_ids = [
+            self.canvas.create_text(100, self.TITLE_HEIGHT / 2, text="Well Status",
+                                    font=("Arial", 14, "bold"))
+        ]
+        
+        # Color indicator and label for each status
+        for i, (label, fill, outline, width) in enumerate(self.STATUSES):
+            y = self.TITLE_HEIGHT + i * self.ROW_HEIGHT
+            self.canvas.create_rectangle(8, y + 3, 28, y + 23, fill=fill, outline=outline, width=width)
+            self._text_ids.append(
+                self.canvas.create_text(40, y + 13, text=label, anchor="w", font=("Arial", 13))
+            )
         
-        excluded_neg_label = ctk.CTkLabel(excluded_neg_frame, text="Excluded Neg. Control")
-        excluded_neg_label.pack(side="left", padx=5)
+        self.refresh_theme()
+    
+    def refresh_theme(self):
+        """Re-apply the theme colors for the current appearance mode to the canvas and its texts."""
+        text_color = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+        self.canvas.configure(bg=self._apply_appearance_mode(self.cget("fg_color")))
+        for item in self._text_ids:
+            self.canvas.itemconfigure(item, fill=text_color)
+    
+    def _set_appearance_mode(self, mode_string):
+        """Called by CustomTkinter when the appearance mode changes; the canvas is not a CTk widget."""
+        super()._set_appearance_mode(mode_string)
+        self.refresh_theme()
@@ -4,12 +4,9 @@ Menu module for the Plates Analyzer application.
 import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import pandas as pd
-import numpy as np
 import customtkinter as ctk
 from src.ui.section_selector import SectionSelectorDialog
 from src.ui.configuration_dialog import ConfigurationDialog
-from src.parser import parse_spectro_excel
 
 class AppMenu:
     """Class to manage application menus."""
@@ -92,6 +89,9 @@ class AppMenu:
             file_path: Path to the file to load.
         """
         try:
+            # The parser pulls in pandas; it is only needed once a file is loaded
+            from src.parser import parse_spectro_excel
+            
             # Update default directory
             self.config.default_directory = os.path.dirname(file_path)
             
@@ -134,18 +134,11 @@ class AppMenu:
         Args:
             sections: List of section dictionaries.
         """
-        # Update the parent's sections
-        self.parent.sections = sections
-        
-        # Extract section names and wells
-        self.parent.section_names = [s['name'] for s in sections]
-        self.parent.section_wells = [s['wells'] for s in sections]
-        
         # Save sections to config
         self.config.update_sections(sections)
         
-        # Rebuild the grid
-        self.parent.build_grid()
+        # Update the parent's sections (validates them, excludes orphans and rebuilds the grid)
+        self.parent.set_sections(sections)
     
     def show_configuration(self):
         """Show the configuration dialog."""
@@ -25,7 +25,7 @@ class SectionSelectorDialog(ctk.CTkToplevel):
                 self.sections.append(new_sec)
         else:
             self.sections = []
-        self.section_colors = initial_colors.copy() if initial_colors else [
+        self.section_colors = list(initial_colors) if initial_colors else [
             '#FF9999', '#99FF99', '#9999FF', '#FFFF99', '#FF99FF', '#99FFFF', '#FFA07A', '#90EE90', '#87CEFA', '#FFD700'
         ]
         self.current_section_index = 0
@@ -96,9 +96,13 @@ class SectionSelectorDialog(ctk.CTkToplevel):
         self._update_grid_colors()
 
     def _update_grid_colors(self):
+        # Wells that belong to some section, built once per update instead of
+        # scanning every section's well list for each of the 96 buttons
+        section_wells = set()
         # Mark wells of existing sections
         for idx, section in enumerate(self.sections):
             wells = [tuple(w) for w in section['wells']]  # Ensure tuples
+            section_wells.update(wells)
             color = self.section_colors[idx % len(self.section_colors)]
             for well in wells:
                 if well in self.buttons:
@@ -107,7 +111,7 @@ class SectionSelectorDialog(ctk.CTkToplevel):
         for well in self.buttons:
             if well in self.selected_wells:
                 self.buttons[well].configure(fg_color="#2222FF", text_color="white")
-            elif not any(well in section['wells'] for section in self.sections):
+            elif well not in section_wells:
                 self.buttons[well].configure(fg_color="transparent", text_color="black")
 
     def confirm_section(self, event=None):
@@ -1,10 +1,122 @@
 """
 Module for plate data visualization.
 """
+import base64
+import io
+import json
+import os
+from collections import Counter
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
 from scipy import interpolate
 
+# Tipos de numpy que Plotly.js (>= 2.28) acepta como arrays binarios
+_TYPED_ARRAY_DTYPES = {np.dtype('float64'): 'f8', np.dtype('float32'): 'f4'}
+
+# A partir de este número de puntos las trazas 2D se dibujan con WebGL (Scattergl)
+_WEBGL_POINT_THRESHOLD = 1000
+
+# Esquinas de una barra 3D (base y tapa) y los 12 triángulos de sus caras
+_BAR_CORNERS_X = np.array([-1, 1, 1, -1, -1, 1, 1, -1], dtype=float)
+_BAR_CORNERS_Y = np.array([-1, -1, 1, 1, -1, -1, 1, 1], dtype=float)
+_BAR_CORNERS_TOP = np.array([False] * 4 + [True] * 4)
+_BAR_FACES = np.array([
+    [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
+    [0, 1, 5], [0, 5, 4], [1, 2, 6], [1, 6, 5],
+    [2, 3, 7], [2, 7, 6], [3, 0, 4], [3, 4, 7]
+])
+
+def _bar_mesh(x, y, z, half_width, half_depth):
+    """
+    Builds the vertices and triangles of a set of 3D bars for a single Mesh3d trace.
+
+    Args:
+        x (numpy.ndarray): X center of each bar.
+        y (numpy.ndarray): Y center of each bar.
+        z (numpy.ndarray): Height of each bar (bars start at z=0).
+        half_width (float): Half of the bar size along x.
+        half_depth (float): Half of the bar size along y.
+
+    Returns:
+        tuple: (x, y, z, i, j, k) arrays for go.Mesh3d.
+    """
+    n_bars = len(x)
+    vx = (x[:, None] + _BAR_CORNERS_X * half_width).ravel()
+    vy = (y[:, None] + _BAR_CORNERS_Y * half_depth).ravel()
+    vz = np.where(_BAR_CORNERS_TOP, z[:, None], 0.0).ravel()
+    triangles = (_BAR_FACES[None, :, :] + 8 * np.arange(n_bars)[:, None, None]).reshape(-1, 3)
+    return vx, vy, vz, triangles[:, 0], triangles[:, 1], triangles[:, 2]
+
+def _error_bar_trace(hours, grays, lows, highs):
+    """
+    Creates a single Scatter3d trace with the error bars of a set of points.
+
+    Each segment [v-s, v+s] is followed by a NaN so Plotly breaks the line between bars.
+
+    Args:
+        hours (numpy.ndarray): Hours of each point.
+        grays (numpy.ndarray): Gray value of each point.
+        lows (numpy.ndarray): Lower end (v-s) of each error bar.
+        highs (numpy.ndarray): Upper end (v+s) of each error bar.
+
+    Returns:
+        plotly.graph_objects.Scatter3d: Error bar trace.
+    """
+    error_z = np.empty(3 * len(lows), dtype=float)
+    error_z[0::3] = lows
+    error_z[1::3] = highs
+    error_z[2::3] = np.nan
+    return go.Scatter3d(
+        x=np.repeat(hours, 3),
+        y=np.repeat(grays, 3),
+        z=error_z,
+        mode='lines',
+        line=dict(color='red', width=2),
+        showlegend=False
+    )
+
+def _build_surface_grid(hours, grays, values, unique_hours, unique_grays):
+    """
+    Builds the rectangular (grays x hours) grid used for the 3D surface.
+
+    Every data point falls on a node of the grid formed by the unique hours and
+    gray values, so the values are scattered directly onto it (averaging points
+    that share a node) and the empty nodes are filled by linear interpolation
+    along the hours axis and then along the grays axis.
+
+    Args:
+        hours (array-like): Hours of each data point.
+        grays (array-like): Gray value of each data point.
+        values (array-like): Value of each data point.
+        unique_hours (numpy.ndarray): Sorted unique hours.
+        unique_grays (numpy.ndarray): Sorted unique gray values.
+
+    Returns:
+        numpy.ndarray: Grid of shape (len(unique_grays), len(unique_hours)).
+    """
+    shape = (len(unique_grays), len(unique_hours))
+    h_idx = np.searchsorted(unique_hours, hours)
+    g_idx = np.searchsorted(unique_grays, grays)
+
+    # bincount sobre el índice plano acumula en un solo paso compilado
+    # (np.add.at es mucho más lento para esta dispersión)
+    flat_idx = np.ravel_multi_index((g_idx, h_idx), shape)
+    size = shape[0] * shape[1]
+    sums = np.bincount(flat_idx, weights=values, minlength=size).reshape(shape)
+    counts = np.bincount(flat_idx, minlength=size).reshape(shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z_grid = sums / counts
+
+    # Rellenar los huecos en C en lugar de recorrer filas y columnas en Python
+    z_grid = (pd.DataFrame(z_grid, index=unique_grays, columns=unique_hours)
+              .interpolate(method='index', axis=1, limit_direction='both')
+              .interpolate(method='index', axis=0, limit_direction='both')
+              .to_numpy())
+    return z_grid
+
 # Modified create_2d_figure function to add arguments for custom title
 def create_2d_figure(plot_df, key, use_percentage=True, show_error_bars=True, use_bar_chart=False, subtract_neg_ctrl=True, 
                     title_prefix="", is_normalized=False, gray_values=None, section_units="grays"):
@@ -47,14 +159,14 @@ def create_2d_figure(plot_df, key, use_percentage=True, show_error_bars=True, us
         # Cada sección será un grupo, y cada punto de tiempo será una barra dentro de ese grupo
         
         # Obtener puntos de tiempo únicos y ordenarlos
-        time_points = sorted(plot_df['hours'].unique())
+        time_points = np.unique(plot_df['hours'].to_numpy())
         num_sections = len(section_cols)
 
         # Calcular el ancho de barra adaptativo basado en el número de puntos de tiempo
         # y el número de secciones
         if len(time_points) > 1:
             # Calcular la distancia mínima entre puntos de tiempo
-            min_distance = min([time_points[i+1] - time_points[i] for i in range(len(time_points)-1)])
+            min_distance = float(np.diff(time_points).min())
 
             # Ajustar el ancho de barra según el número de puntos de tiempo
             if len(time_points) <= 3:
@@ -145,7 +257,9 @@ def create_2d_figure(plot_df, key, use_percentage=True, show_error_bars=True, us
                     y_label = f"{col} (%)" if use_percentage else col
 
             # Añadir trazo con barras de error si están habilitadas
-            fig.add_trace(go.Scatter(
+            # (con muchos puntos se usa WebGL en lugar de SVG)
+            scatter_cls = go.Scattergl if len(plot_df) > _WEBGL_POINT_THRESHOLD else go.Scatter
+            fig.add_trace(scatter_cls(
                 x=plot_df['hours'],
                 y=plot_df[col],
                 mode='lines+markers',
@@ -368,18 +482,32 @@ def create_3d_figure(df, plate, assay, mask, neg_ctrl_mask, sections, section_co
         )
         return fig3d
 
+    # Convertir los datos a arrays una sola vez y precalcular los índices de cada
+    # sección; ambas ramas (barras y superficie) los reutilizan
+    hours_arr = np.asarray(all_hours, dtype=float)
+    grays_arr = np.asarray(all_grays, dtype=float)
+    values_arr = np.asarray(all_values, dtype=float)
+    stds_arr = np.asarray(all_stds, dtype=float)
+    sections_arr = np.asarray(all_sections, dtype=int)
+    section_indices = {section: np.flatnonzero(sections_arr == section)
+                       for section in np.unique(sections_arr).tolist()}
+    unique_hours = np.unique(hours_arr)
+    if show_error_bars:
+        # Extremos de las barras de error para todos los puntos en una sola pasada
+        error_low_arr = values_arr - stds_arr
+        error_high_arr = values_arr + stds_arr
+
     # Determinar si se debe usar gráfico de barras o superficie
     if use_bar_chart:
         write_debug("Creating 3D bar chart")
 
-        # Obtener puntos de tiempo únicos y ordenarlos
-        unique_hours = sorted(list(set(all_hours)))
-        num_sections = len(set(all_sections))
+        # Número de secciones con datos
+        num_sections = len(section_indices)
 
         # Calcular el ancho de barra adaptativo
         if len(unique_hours) > 1:
             # Calcular la distancia mínima entre puntos de tiempo
-            min_distance = min([unique_hours[i+1] - unique_hours[i] for i in range(len(unique_hours)-1)])
+            min_distance = np.diff(unique_hours).min()
 
             # Ajustar el ancho de barra según el número de puntos de tiempo
             if len(unique_hours) <= 3:
@@ -395,14 +523,16 @@ def create_3d_figure(df, plate, assay, mask, neg_ctrl_mask, sections, section_co
             # Valor por defecto si solo hay un punto de tiempo
             bar_width = 0.15
 
-        # Crear un gráfico de barras 3D usando Scatter3d con marcadores
-        for section in sorted(set(all_sections)):
+        # Profundidad de barra en el eje de grays
+        unique_grays = np.unique(grays_arr)
+        bar_depth = np.diff(unique_grays).min() * 0.4 if len(unique_grays) > 1 else 0.5
+
+        # Crear un gráfico de barras 3D usando una malla (Mesh3d) por sección
+        for section, indices in section_indices.items():
             # Filtrar datos para esta sección
-            indices = [i for i, s in enumerate(all_sections) if s == section]
-            section_hours = [all_hours[i] for i in indices]
-            section_grays = [all_grays[i] for i in indices]
-            section_values = [all_values[i] for i in indices]
-            section_stds = [all_stds[i] for i in indices]
+            section_hours = hours_arr[indices]
+            section_grays = grays_arr[indices]
+            section_values = values_arr[indices]
 
             # Usar el índice de sección para obtener el color (section va de 1 a 6)
             section_color = section_colors[section-1]
@@ -411,18 +541,39 @@ def create_3d_figure(df, plate, assay, mask, neg_ctrl_mask, sections, section_co
             # para que estén centradas alrededor del punto de tiempo
             section_idx = section - 1  # Convertir a índice base 0
             offset = (section_idx - (num_sections - 1) / 2) * bar_width * 1.2  # Añadir un poco más de espacio
+
+            # Todas las barras de la sección en una sola malla
+            mesh_x, mesh_y, mesh_z, mesh_i, mesh_j, mesh_k = _bar_mesh(
+                section_hours + offset, section_grays, section_values, bar_width / 2, bar_depth / 2
+            )
+            fig3d.add_trace(go.Mesh3d(
+                x=mesh_x,
+                y=mesh_y,
+                z=mesh_z,
+                i=mesh_i,
+                j=mesh_j,
+                k=mesh_k,
+                color=section_color,
+                opacity=0.8,
+                flatshading=True,
+                name=f'S{section}',
+                showlegend=True
+            ))
+
+            if show_error_bars:
+                fig3d.add_trace(_error_bar_trace(section_hours + offset, section_grays,
+                                                 error_low_arr[indices], error_high_arr[indices]))
     else:
         write_debug("Creating 3D surface plot")
 
         # FIXED: Create a single unified surface for all data points
 
         # First, add scatter points for all data
-        for section in sorted(set(all_sections)):
+        for section, indices in section_indices.items():
             # Filtrar datos para esta sección
-            indices = [i for i, s in enumerate(all_sections) if s == section]
-            section_hours = [all_hours[i] for i in indices]
-            section_grays = [all_grays[i] for i in indices]
-            section_values = [all_values[i] for i in indices]
+            section_hours = hours_arr[indices]
+            section_grays = grays_arr[indices]
+            section_values = values_arr[indices]
 
             # Usar el índice de sección para obtener el color (section va de 1 a 6)
             section_color = section_colors[section-1]
@@ -443,51 +594,37 @@ def create_3d_figure(df, plate, assay, mask, neg_ctrl_mask, sections, section_co
 
             # Add error bars if enabled
             if show_error_bars:
-                section_stds = [all_stds[i] for i in indices]
-                for h, g, v, s in zip(section_hours, section_grays, section_values, section_stds):
-                    fig3d.add_trace(go.Scatter3d(
-                        x=[h, h],
-                        y=[g, g],
-                        z=[v-s, v+s],
-                        mode='lines',
-                        line=dict(color='red', width=2),
-                        showlegend=False
-                    ))
+                fig3d.add_trace(_error_bar_trace(section_hours, section_grays,
+                                                 error_low_arr[indices], error_high_arr[indices]))
 
         # Now create a single unified surface
         if len(all_hours) >= 4:  # Need at least 4 points for interpolation
             try:
                 # Create a grid for interpolation
-                unique_hours = sorted(list(set(all_hours)))
-                unique_grays = sorted(list(set(all_grays)))
+                unique_grays = np.unique(grays_arr)
 
                 if len(unique_hours) >= 2 and len(unique_grays) >= 2:
                     # Create a grid for interpolation
                     grid_x, grid_y = np.meshgrid(
-                        np.linspace(min(unique_hours), max(unique_hours), 30),
-                        np.linspace(min(unique_grays), max(unique_grays), 30)
+                        np.linspace(unique_hours[0], unique_hours[-1], 30),
+                        np.linspace(unique_grays[0], unique_grays[-1], 30)
                     )
 
-                    # Prepare points for interpolation
-                    points = np.array(list(zip(all_hours, all_grays)))
-                    values = np.array(all_values)
-
-                    # Use griddata for interpolation
-                    grid_z = interpolate.griddata(
-                        points,
-                        values,
-                        (grid_x, grid_y),
+                    # Los datos ya están sobre una rejilla rectangular (horas x grays),
+                    # así que se usa un interpolador de rejilla en lugar de triangular
+                    z_grid = _build_surface_grid(hours_arr, grays_arr, values_arr,
+                                                 unique_hours, unique_grays)
+                    interpolator = interpolate.RegularGridInterpolator(
+                        (unique_grays, unique_hours),
+                        z_grid,
                         method='linear',
+                        bounds_error=False,
                         fill_value=np.nan
                     )
+                    # float32 basta para mostrar la superficie y reduce a la mitad su tamaño en el HTML
+                    grid_z = interpolator((grid_y, grid_x)).astype(np.float32)
 
-                    # Create a colorscale that transitions through all section colors
-                    colorscale = []
-                    for i, color in enumerate(section_colors):
-                        colorscale.append([i/len(section_colors), color])
-                        colorscale.append([(i+1)/len(section_colors), color])
-
-                    # Add surface with custom colorscale
+                    # Add surface
                     fig3d.add_trace(go.Surface(
                         z=grid_z,
                         x=grid_x,
@@ -542,6 +679,110 @@ def create_3d_figure(df, plate, assay, mask, neg_ctrl_mask, sections, section_co
     write_debug("Figura 3D creada exitosamente")
     return fig3d
 
+def _to_typed_array_spec(array):
+    """
+    Converts a numeric array to the base64 typed-array spec understood by Plotly.js.
+
+    Args:
+        array (numpy.ndarray): Float array to encode.
+
+    Returns:
+        dict: Typed-array spec with 'dtype', 'bdata' and, for 2D arrays, 'shape'.
+    """
+    array = np.ascontiguousarray(array)
+    spec = {
+        'dtype': _TYPED_ARRAY_DTYPES[array.dtype],
+        'bdata': base64.b64encode(array.tobytes()).decode('ascii')
+    }
+    if array.ndim > 1:
+        spec['shape'] = ','.join(str(dim) for dim in array.shape)
+    return spec
+
+def _array_key(array):
+    """
+    Returns a hashable key identifying the contents of a numeric array.
+
+    Args:
+        array (numpy.ndarray): Array to identify.
+
+    Returns:
+        tuple: (dtype, shape, raw bytes) of the array.
+    """
+    return array.dtype.str, array.shape, np.ascontiguousarray(array).tobytes()
+
+def _repeated_arrays(keys, *figure_dicts):
+    """
+    Finds the x/y/z arrays used by the figures of more than one plate-assay.
+
+    Only these (typically the hours and grays axes) are worth moving to the
+    shared registry; arrays unique to a plate-assay stay in its own script.
+
+    Args:
+        keys (iterable): Plate-assay keys.
+        *figure_dicts (dict): Dictionaries of figures by plate-assay key.
+
+    Returns:
+        set: Keys (see _array_key) of the arrays repeated across plate-assays.
+    """
+    counts = Counter()
+    for key in keys:
+        plate_arrays = set()
+        for figures in figure_dicts:
+            if key not in figures:
+                continue
+            for trace in figures[key].data:
+                for prop in ('x', 'y', 'z'):
+                    value = getattr(trace, prop, None)
+                    if isinstance(value, np.ndarray) and value.dtype in _TYPED_ARRAY_DTYPES:
+                        plate_arrays.add(_array_key(value))
+        counts.update(plate_arrays)
+    return {array_key for array_key, count in counts.items() if count > 1}
+
+def _figure_to_json(fig, shared_arrays=None, shareable=None):
+    """
+    Serializes a figure to JSON, embedding float x/y/z arrays as base64 typed arrays.
+
+    Args:
+        fig (plotly.graph_objects.Figure): Figure to serialize.
+        shared_arrays (dict, optional): Registry of arrays shared between figures,
+            mapping (dtype, shape, bdata) to an index. If given, each shared typed
+            array is stored once in the registry and the figure only keeps its index.
+        shareable (set, optional): Keys (see _array_key) of the arrays that may go
+            to the registry. If None, every typed array is shared.
+
+    Returns:
+        str: JSON representation of the figure.
+    """
+    fig_dict = fig.to_plotly_json()
+    for trace in fig_dict.get('data', []):
+        for prop in ('x', 'y', 'z'):
+            value = trace.get(prop)
+            if isinstance(value, np.ndarray) and value.dtype in _TYPED_ARRAY_DTYPES:
+                spec = _to_typed_array_spec(value)
+                if shared_arrays is not None and (shareable is None or _array_key(value) in shareable):
+                    spec_key = (spec['dtype'], spec.get('shape'), spec['bdata'])
+                    spec = {'sharedArray': shared_arrays.setdefault(spec_key, len(shared_arrays))}
+                trace[prop] = spec
+    return to_json_plotly(fig_dict)
+
+def _shared_arrays_to_json(shared_arrays):
+    """
+    Serializes the shared array registry as a JSON list indexed by array id.
+
+    Args:
+        shared_arrays (dict): Registry filled by _figure_to_json.
+
+    Returns:
+        str: JSON list of typed-array specs.
+    """
+    specs = [None] * len(shared_arrays)
+    for (dtype, shape, bdata), index in shared_arrays.items():
+        spec = {'dtype': dtype, 'bdata': bdata}
+        if shape is not None:
+            spec['shape'] = shape
+        specs[index] = spec
+    return json.dumps(specs)
+
 # Modified generate_html_content function to support normalized plots
 def generate_html_content(figures_2d, figures_2d_norm, figures_3d, figures_3d_norm):
     """
@@ -556,12 +797,118 @@ def generate_html_content(figures_2d, figures_2d_norm, figures_3d, figures_3d_no
     Returns:
         str: HTML content.
     """
-    html_content = """
+    buffer = io.StringIO()
+    write_html_content(buffer, figures_2d, figures_2d_norm, figures_3d, figures_3d_norm)
+    return buffer.getvalue()
+
+def save_html_content(html_path, figures_2d, figures_2d_norm, figures_3d, figures_3d_norm):
+    """
+    Writes the HTML visualization of the 2D and 3D figures to a file.
+
+    The figures of each plate-assay are written to their own script in a 'figs'
+    folder next to the HTML file, and the page loads them only when that
+    plate-assay is selected.
+
+    Args:
+        html_path (str): Path of the HTML file to write.
+        figures_2d (dict): Dictionary of original 2D figures.
+        figures_2d_norm (dict): Dictionary of normalized 2D figures.
+        figures_3d (dict): Dictionary of original 3D figures.
+        figures_3d_norm (dict): Dictionary of normalized 3D figures.
+    """
+    figures_dir_name = "figs"
+    figures_dir = os.path.join(os.path.dirname(html_path), figures_dir_name)
+    os.makedirs(figures_dir, exist_ok=True)
+
+    # Solo los arrays que se repiten entre placas-ensayo (horas, grays...) van al
+    # registro compartido de la página; el resto se queda en el script de su placa
+    shareable = _repeated_arrays(figures_2d.keys(), figures_2d, figures_2d_norm, figures_3d, figures_3d_norm)
+
+    # Un script por placa-ensayo; se escribe y se libera antes de pasar a la siguiente
+    figure_scripts = {}
+    shared_arrays = {}
+    for i, key in enumerate(figures_2d.keys()):
+        script_name = f"{i}.js"
+        with open(os.path.join(figures_dir, script_name), "w", encoding="utf-8") as f:
+            _write_figure_assignments(f, key, figures_2d, figures_2d_norm, figures_3d, figures_3d_norm,
+                                      shared_arrays, shareable)
+        figure_scripts[key] = f"{figures_dir_name}/{script_name}"
+
+    with open(html_path, "w", encoding="utf-8") as f:
+        write_html_content(f, figures_2d, figures_2d_norm, figures_3d, figures_3d_norm,
+                           figure_scripts=figure_scripts, shared_arrays=shared_arrays)
+
+def _write_figure_assignments(f, key, figures_2d, figures_2d_norm, figures_3d, figures_3d_norm,
+                              shared_arrays=None, shareable=None):
+    """
+    Writes the JavaScript assignments that register the figures of one plate-assay.
+
+    Args:
+        f (io.TextIOBase): Text stream to write to.
+        key (str): Plate-assay key.
+        figures_2d (dict): Dictionary of original 2D figures.
+        figures_2d_norm (dict): Dictionary of normalized 2D figures.
+        figures_3d (dict): Dictionary of original 3D figures.
+        figures_3d_norm (dict): Dictionary of normalized 3D figures.
+        shared_arrays (dict, optional): Registry of arrays shared between figures.
+        shareable (set, optional): Arrays that may go to the registry (see _figure_to_json).
+    """
+    # Las figuras ya fueron validadas al construirlas, así que se serializan sin
+    # revalidar y con los arrays numéricos en binario (base64)
+    for variable, figures in (('figures2D', figures_2d), ('figures2DNorm', figures_2d_norm),
+                              ('figures3D', figures_3d), ('figures3DNorm', figures_3d_norm)):
+        if key in figures:
+            f.write(f'{variable}["{key}"] = {_figure_to_json(figures[key], shared_arrays, shareable)};\n')
+
+def _write_figure_block(f, block_id, key, figures_2d, figures_2d_norm, figures_3d, figures_3d_norm,
+                        shared_arrays=None):
+    """
+    Writes the figures of one plate-assay as an inert JSON script block.
+
+    Args:
+        f (io.TextIOBase): Text stream to write to.
+        block_id (str): Id of the script element.
+        key (str): Plate-assay key.
+        figures_2d (dict): Dictionary of original 2D figures.
+        figures_2d_norm (dict): Dictionary of normalized 2D figures.
+        figures_3d (dict): Dictionary of original 3D figures.
+        figures_3d_norm (dict): Dictionary of normalized 3D figures.
+        shared_arrays (dict, optional): Registry of arrays shared between figures.
+    """
+    f.write(f'<script type="application/json" id="{block_id}">{{')
+    separator = ''
+    for name, figures in (('figures2D', figures_2d), ('figures2DNorm', figures_2d_norm),
+                          ('figures3D', figures_3d), ('figures3DNorm', figures_3d_norm)):
+        if key in figures:
+            # "</" cerraría el bloque <script>; "<\/" es equivalente en JSON
+            figure_json = _figure_to_json(figures[key], shared_arrays).replace('</', '<\\/')
+            f.write(f'{separator}"{name}": {figure_json}')
+            separator = ', '
+    f.write('}</script>\n')
+
+def write_html_content(f, figures_2d, figures_2d_norm, figures_3d, figures_3d_norm, figure_scripts=None,
+                       shared_arrays=None):
+    """
+    Streams the HTML visualization to a file-like object, one figure at a time.
+
+    Args:
+        f (io.TextIOBase): Text stream to write to.
+        figures_2d (dict): Dictionary of original 2D figures.
+        figures_2d_norm (dict): Dictionary of normalized 2D figures.
+        figures_3d (dict): Dictionary of original 3D figures.
+        figures_3d_norm (dict): Dictionary of normalized 3D figures.
+        figure_scripts (dict, optional): Mapping of plate-assay key to the script
+            holding its figures. If None, the figures are embedded in the page as
+            JSON blocks that are parsed when their plate-assay is first shown.
+        shared_arrays (dict, optional): Registry of the arrays referenced by the
+            figure scripts. Ignored when the figures are embedded in the page.
+    """
+    f.write("""
 <!DOCTYPE html>
 <html>
 <head>
     <title>Plate Analysis Results</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="https://cdn.plot.ly/plotly-2.32.0.min.js"></script>
     <style>
         body { font-family: Arial, sans-serif; margin: 20px; }
         .container { max-width: 100%; margin: 0 auto; }
@@ -659,14 +1006,14 @@ def generate_html_content(figures_2d, figures_2d_norm, figures_3d, figures_3d_no
         <div style="display: flex; align-items: center;">
             <label for="plot-selector">Select Plate:</label>
             <select id="plot-selector" onchange="showPlot(this.value)">
-"""
+""")
 
     # Añadir opciones para cada figura
     for i, key in enumerate(figures_2d.keys()):
         selected = "selected" if i == 0 else ""
-        html_content += f'<option value="{key}" {selected}>{key}</option>\n'
+        f.write(f'<option value="{key}" {selected}>{key}</option>\n')
 
-    html_content += """
+    f.write("""
             </select>
             <button class="export-btn" onclick="exportCurrentPlot()">Export as PNG</button>
             <div class="checkbox-container">
@@ -722,7 +1069,20 @@ def generate_html_content(figures_2d, figures_2d_norm, figures_3d, figures_3d_no
             </div>
         </div>
     </div>
-    
+""")
+
+    figure_blocks = {}
+    if figure_scripts is None:
+        # Incrustar las figuras como bloques JSON que el navegador no evalúa
+        # hasta que se selecciona su placa-ensayo
+        shared_arrays = {}
+        for i, key in enumerate(figures_2d.keys()):
+            figure_blocks[key] = f"figures-{i}"
+            _write_figure_block(f, figure_blocks[key], key, figures_2d, figures_2d_norm, figures_3d,
+                                figures_3d_norm, shared_arrays)
+        figure_scripts = {}
+
+    f.write("""
     <script>
         // Store all the figures
         const figures2D = {};
@@ -741,92 +1101,88 @@ def generate_html_content(figures_2d, figures_2d_norm, figures_3d, figures_3d_no
         
         // Add resize event listener
         window.addEventListener('resize', handleResize);
-"""
-
-    # Añadir cada figura 2D original como JSON
-    for key, fig in figures_2d.items():
-        fig_json = fig.to_json()
-        html_content += f'figures2D["{key}"] = {fig_json};\n'
-
-    # Añadir cada figura 2D normalizada como JSON
-    for key, fig in figures_2d_norm.items():
-        fig_json = fig.to_json()
-        html_content += f'figures2DNorm["{key}"] = {fig_json};\n'
-
-    # Añadir cada figura 3D original como JSON
-    for key, fig3d in figures_3d.items():
-        fig3d_json = fig3d.to_json()
-        html_content += f'figures3D["{key}"] = {fig3d_json};\n'
-
-    # Añadir cada figura 3D normalizada como JSON
-    for key, fig3d_norm in figures_3d_norm.items():
-        fig3d_json = fig3d_norm.to_json()
-        html_content += f'figures3DNorm["{key}"] = {fig3d_json};\n'
-
-    html_content += """
+""")
+
+    # Arrays (horas, grays, ...) comunes a varias figuras, escritos una sola vez
+    f.write(f'const sharedArrays = {_shared_arrays_to_json(shared_arrays or {})};\n')
+    f.write(f'const figureScripts = {json.dumps(figure_scripts)};\n')
+    f.write(f'const figureBlocks = {json.dumps(figure_blocks)};\n')
+
+    f.write("""
+        // Load the figures of a plate-assay on demand, then call the callback
+        function loadFigures(key, callback) {
+            if (figures2D[key] === undefined && key in figureBlocks) {
+                // Parse the embedded JSON only the first time the plate-assay is shown
+                const figures = JSON.parse(document.getElementById(figureBlocks[key]).textContent);
+                figures2D[key] = figures.figures2D;
+                figures2DNorm[key] = figures.figures2DNorm;
+                figures3D[key] = figures.figures3D;
+                figures3DNorm[key] = figures.figures3DNorm;
+            }
+            if (figures2D[key] !== undefined || !(key in figureScripts)) {
+                callback();
+                return;
+            }
+            const script = document.createElement('script');
+            script.src = figureScripts[key];
+            script.onload = callback;
+            document.head.appendChild(script);
+        }
+        
         // Function to show the selected plot
         function showPlot(key) {
+            loadFigures(key, function() { renderPlot(key); });
+        }
+        
+        // Replace the references to shared arrays with the arrays themselves
+        function hydrateFigure(figure) {
+            if (figure.hydrated) {
+                return;
+            }
+            figure.data.forEach(function(trace) {
+                ['x', 'y', 'z'].forEach(function(prop) {
+                    const value = trace[prop];
+                    if (value && value.sharedArray !== undefined) {
+                        trace[prop] = sharedArrays[value.sharedArray];
+                    }
+                });
+            });
+            figure.hydrated = true;
+        }
+        
+        // Render a stored figure in place, without cloning it. Only the y-axis
+        // type is changed afterwards (2D plots) through Plotly.relayout.
+        function reactFigure(containerId, figure, logScale) {
+            hydrateFigure(figure);
+            
+            // Make sure the layout is responsive
+            figure.layout.autosize = true;
+            figure.layout.height = 650;
+            
+            Plotly.react(containerId, figure.data, figure.layout);
+            
+            if (logScale !== undefined) {
+                Plotly.relayout(containerId, {'yaxis.type': logScale ? 'log' : 'linear'});
+            }
+        }
+        
+        // Function to render the selected plot once its figures are loaded
+        function renderPlot(key) {
             // Get active tab
             const activeTab = document.querySelector('.tablinks.active');
             const tabName = activeTab.textContent.trim();
             
             if (tabName === '2D View') {
-                // Show 2D plot (original)
-                const currentFigure = JSON.parse(JSON.stringify(figures2D[key]));
-                
-                // Apply log scale if checkbox is checked
-                if (useLogScale) {
-                    currentFigure.layout.yaxis = currentFigure.layout.yaxis || {};
-                    currentFigure.layout.yaxis.type = 'log';
-                } else {
-                    currentFigure.layout.yaxis = currentFigure.layout.yaxis || {};
-                    currentFigure.layout.yaxis.type = 'linear';
-                }
-                
-                // Make sure the layout is responsive
-                currentFigure.layout.autosize = true;
-                currentFigure.layout.height = 650;
-                
-                Plotly.react('plot-container-2d', currentFigure.data, currentFigure.layout);
-                
-                // Show 2D plot (normalized)
-                const currentFigureNorm = JSON.parse(JSON.stringify(figures2DNorm[key]));
-                
-                // Apply log scale if checkbox is checked
-                if (useLogScale) {
-                    currentFigureNorm.layout.yaxis = currentFigureNorm.layout.yaxis || {};
-                    currentFigureNorm.layout.yaxis.type = 'log';
-                } else {
-                    currentFigureNorm.layout.yaxis = currentFigureNorm.layout.yaxis || {};
-                    currentFigureNorm.layout.yaxis.type = 'linear';
-                }
-                
-                // Make sure the layout is responsive
-                currentFigureNorm.layout.autosize = true;
-                currentFigureNorm.layout.height = 650;
-                
-                Plotly.react('plot-container-2d-norm', currentFigureNorm.data, currentFigureNorm.layout);
+                // Show 2D plots (original and normalized), applying log scale if checked
+                reactFigure('plot-container-2d', figures2D[key], useLogScale);
+                reactFigure('plot-container-2d-norm', figures2DNorm[key], useLogScale);
                 
                 // Update slider visibility based on scroll position
                 updateSliderVisibility('2D');
             } else {
-                // Show 3D plot (original)
-                const currentFigure = JSON.parse(JSON.stringify(figures3D[key]));
-                
-                // Make sure the layout is responsive
-                currentFigure.layout.autosize = true;
-                currentFigure.layout.height = 650;
-                
-                Plotly.react('plot-container-3d', currentFigure.data, currentFigure.layout);
-                
-                // Show 3D plot (normalized)
-                const currentFigureNorm = JSON.parse(JSON.stringify(figures3DNorm[key]));
-                
-                // Make sure the layout is responsive
-                currentFigureNorm.layout.autosize = true;
-                currentFigureNorm.layout.height = 650;
-                
-                Plotly.react('plot-container-3d-norm', currentFigureNorm.data, currentFigureNorm.layout);
+                // Show 3D plots (original and normalized)
+                reactFigure('plot-container-3d', figures3D[key]);
+                reactFigure('plot-container-3d-norm', figures3DNorm[key]);
                 
                 // Update slider visibility based on scroll position
                 updateSliderVisibility('3D');
@@ -951,6 +1307,4 @@ def generate_html_content(figures_2d, figures_2d_norm, figures_3d, figures_3d_no
     </script>
 </body>
 </html>
-"""
-
-    return html_content
+""")
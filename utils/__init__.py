@@ -5,12 +5,14 @@ from .config import Config
 from .file_utils import (
     save_masks_to_csv, load_masks_from_csv,
     save_neg_ctrl_masks_to_csv, load_neg_ctrl_masks_from_csv,
-    save_grays_to_csv, load_grays_from_csv
+    save_grays_to_csv, load_grays_from_csv,
+    save_masks_to_npz, load_masks_from_npz
 )
 
 __all__ = [
     'Config',
     'save_masks_to_csv', 'load_masks_from_csv',
     'save_neg_ctrl_masks_to_csv', 'load_neg_ctrl_masks_from_csv',
-    'save_grays_to_csv', 'load_grays_from_csv'
+    'save_grays_to_csv', 'load_grays_from_csv',
+    'save_masks_to_npz', 'load_masks_from_npz'
 ]
@@ -5,7 +5,6 @@ Handles loading and saving of all application settings.
 import os
 import json
 import numpy as np
-import pandas as pd
 
 class Config:
     """Class to manage application configuration."""
@@ -2,11 +2,72 @@
 Utility module for file operations.
 """
 import os
+import io
 import csv
+from itertools import repeat
 import numpy as np
-import pandas as pd
 import logging
 
+logger = logging.getLogger('plate_analyzer')
+
+def _write_masks_csv(file_path, mask_map):
+    """
+    Write a mask dictionary as a long-format CSV (plate_assay, row, col, value).
+    
+    All masks are stacked into one (K, 96) array and converted to Python values
+    in a single call; the CSV is built in memory and written to disk at once.
+    
+    Args:
+        file_path (str): Path to the CSV file.
+        mask_map (dict): Dictionary of 8x12 masks.
+    """
+    keys, masks = _stack_masks(mask_map)
+    rows, cols = (axis.tolist() for axis in np.indices((8, 12)).reshape(2, -1))
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(['plate_assay', 'row', 'col', 'value'])
+    for key, values in zip(keys.tolist(), masks.reshape(len(keys), -1).tolist()):
+        writer.writerows(zip(repeat(key), rows, cols, values))
+    with open(file_path, 'w', newline='', buffering=1 << 16) as f:
+        f.write(buffer.getvalue())
+
+def _read_keyed_csv(file_path):
+    """
+    Read a plate_assay-keyed CSV and bucket its numeric columns by key.
+    
+    Avoids pandas' parser and groupby: the files are small and this runs at startup.
+    
+    Args:
+        file_path (str): Path to a CSV whose first column is plate_assay and the
+            remaining columns are numeric.
+        
+    Returns:
+        dict: plate_assay -> float array of shape (n_rows, n_columns - 1).
+    """
+    with open(file_path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {}
+        keys = []
+        values = []
+        for row in reader:
+            if row:
+                keys.append(row[0])
+                values.append(row[1:])
+    
+    if not keys:
+        return {}
+    
+    keys_arr = np.array(keys)
+    values_arr = np.array(values, dtype=float).reshape(len(keys), len(header) - 1)
+    
+    # Ordenar por clave (estable) y partir en bloques contiguos por plate_assay
+    order = np.argsort(keys_arr, kind='stable')
+    split = np.flatnonzero(keys_arr[order][1:] != keys_arr[order][:-1]) + 1
+    return {str(keys_arr[block[0]]): values_arr[block] for block in np.split(order, split)}
+
 def save_masks_to_csv(file_path, mask_map):
     """
     Save all masks to a CSV file.
@@ -16,20 +77,11 @@ def save_masks_to_csv(file_path, mask_map):
         mask_map (dict): Dictionary of well masks.
     """
     try:
-        with open(file_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            # Write header
-            writer.writerow(['plate_assay', 'row', 'col', 'value'])
-            
-            # Write each mask
-            for key, mask in mask_map.items():
-                for i in range(8):
-                    for j in range(12):
-                        writer.writerow([key, i, j, mask[i, j]])
+        _write_masks_csv(file_path, mask_map)
         
-        logging.getLogger('plate_analyzer').info(f"Masks saved to {file_path}")
+        logger.info(f"Masks saved to {file_path}")
     except Exception as e:
-        logging.getLogger('plate_analyzer').error(f"Error saving masks: {e}")
+        logger.error(f"Error saving masks: {e}")
 
 def load_masks_from_csv(file_path, mask_map):
     """
@@ -40,33 +92,30 @@ def load_masks_from_csv(file_path, mask_map):
         mask_map (dict): Dictionary of well masks to update.
     """
     if not os.path.exists(file_path):
-        logging.getLogger('plate_analyzer').warning(f"Mask file {file_path} not found. Using default masks.")
+        logger.warning(f"Mask file {file_path} not found. Using default masks.")
         return
         
     try:
-        # Read the CSV file
-        df = pd.read_csv(file_path)
-        
-        # Group by plate_assay
-        for key, group in df.groupby('plate_assay'):
+        # Read the CSV file, grouped by plate_assay
+        for key, block in _read_keyed_csv(file_path).items():
             # Skip if the key is not in our current keys
             if key not in mask_map:
                 continue
                 
             # Initialize a new mask
-            mask = np.ones((8, 12), dtype=float)
+            mask = np.ones((8, 12), dtype=np.uint8)
             
-            # Fill in mask values
-            for _, row in group.iterrows():
-                i, j = int(row['row']), int(row['col'])
-                mask[i, j] = row['value']
+            # Fill in mask values with a single vectorized assignment
+            rows = block[:, 0].astype(int)
+            cols = block[:, 1].astype(int)
+            mask[rows, cols] = block[:, 2]
             
             # Update the mask map
             mask_map[key] = mask
             
-        logging.getLogger('plate_analyzer').info(f"Masks loaded from {file_path}")
+        logger.info(f"Masks loaded from {file_path}")
     except Exception as e:
-        logging.getLogger('plate_analyzer').error(f"Error loading masks: {e}")
+        logger.error(f"Error loading masks: {e}")
 
 def save_neg_ctrl_masks_to_csv(file_path, neg_ctrl_mask_map):
     """
@@ -77,20 +126,11 @@ def save_neg_ctrl_masks_to_csv(file_path, neg_ctrl_mask_map):
         neg_ctrl_mask_map (dict): Dictionary of negative control masks.
     """
     try:
-        with open(file_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            # Write header
-            writer.writerow(['plate_assay', 'row', 'col', 'value'])
-            
-            # Write each mask
-            for key, mask in neg_ctrl_mask_map.items():
-                for i in range(8):
-                    for j in range(12):
-                        writer.writerow([key, i, j, mask[i, j]])
+        _write_masks_csv(file_path, neg_ctrl_mask_map)
         
-        logging.getLogger('plate_analyzer').info(f"Negative control masks saved to {file_path}")
+        logger.info(f"Negative control masks saved to {file_path}")
     except Exception as e:
-        logging.getLogger('plate_analyzer').error(f"Error saving negative control masks: {e}")
+        logger.error(f"Error saving negative control masks: {e}")
 
 def load_neg_ctrl_masks_from_csv(file_path, neg_ctrl_mask_map):
     """
@@ -101,33 +141,102 @@ def load_neg_ctrl_masks_from_csv(file_path, neg_ctrl_mask_map):
         neg_ctrl_mask_map (dict): Dictionary of negative control masks to update.
     """
     if not os.path.exists(file_path):
-        logging.getLogger('plate_analyzer').warning(f"Negative control mask file {file_path} not found. Using default masks.")
+        logger.warning(f"Negative control mask file {file_path} not found. Using default masks.")
         return
         
     try:
-        # Read the CSV file
-        df = pd.read_csv(file_path)
-        
-        # Group by plate_assay
-        for key, group in df.groupby('plate_assay'):
+        # Read the CSV file, grouped by plate_assay
+        for key, block in _read_keyed_csv(file_path).items():
             # Skip if the key is not in our current keys
             if key not in neg_ctrl_mask_map:
                 continue
                 
             # Initialize a new mask
-            mask = np.zeros((8, 12), dtype=float)
+            mask = np.zeros((8, 12), dtype=np.uint8)
             
-            # Fill in mask values
-            for _, row in group.iterrows():
-                i, j = int(row['row']), int(row['col'])
-                mask[i, j] = row['value']
+            # Fill in mask values with a single vectorized assignment
+            rows = block[:, 0].astype(int)
+            cols = block[:, 1].astype(int)
+            mask[rows, cols] = block[:, 2]
             
             # Update the mask map
             neg_ctrl_mask_map[key] = mask
             
-        logging.getLogger('plate_analyzer').info(f"Negative control masks loaded from {file_path}")
+        logger.info(f"Negative control masks loaded from {file_path}")
     except Exception as e:
-        logging.getLogger('plate_analyzer').error(f"Error loading negative control masks: {e}")
+        logger.error(f"Error loading negative control masks: {e}")
+
+def _stack_masks(mask_map):
+    """
+    Stack a mask dictionary into a key array and a (K, 8, 12) uint8 mask array.
+    
+    Mask values are 0/1, so one byte per well is enough (8x smaller than float64).
+    
+    Args:
+        mask_map (dict): Dictionary of 8x12 masks.
+        
+    Returns:
+        tuple: (keys, masks) numpy arrays.
+    """
+    keys = list(mask_map.keys())
+    if keys:
+        masks = np.stack([np.asarray(mask_map[key], dtype=np.uint8) for key in keys])
+    else:
+        masks = np.empty((0, 8, 12), dtype=np.uint8)
+    return np.array(keys, dtype=str), masks
+
+def save_masks_to_npz(file_path, mask_map, neg_ctrl_mask_map):
+    """
+    Save the well and negative control masks of all plates to a single NumPy .npz file.
+    
+    Each dictionary is stored as an array of keys and a stacked (K, 8, 12) array,
+    so no text has to be written or parsed.
+    
+    Args:
+        file_path (str): Path to the .npz file.
+        mask_map (dict): Dictionary of well masks.
+        neg_ctrl_mask_map (dict): Dictionary of negative control masks.
+        
+    Returns:
+        bool: True if the file was written, False otherwise.
+    """
+    try:
+        keys, masks = _stack_masks(mask_map)
+        neg_ctrl_keys, neg_ctrl_masks = _stack_masks(neg_ctrl_mask_map)
+        with open(file_path, 'wb') as f:
+            np.savez(f, keys=keys, masks=masks, neg_ctrl_keys=neg_ctrl_keys, neg_ctrl_masks=neg_ctrl_masks)
+        
+        logger.info(f"Masks saved to {file_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Error saving masks: {e}")
+        return False
+
+def load_masks_from_npz(file_path, mask_map, neg_ctrl_mask_map):
+    """
+    Load the well and negative control masks from a .npz file if it exists.
+    
+    Args:
+        file_path (str): Path to the .npz file.
+        mask_map (dict): Dictionary of well masks to update.
+        neg_ctrl_mask_map (dict): Dictionary of negative control masks to update.
+    """
+    if not os.path.exists(file_path):
+        logger.warning(f"Mask file {file_path} not found. Using default masks.")
+        return
+    
+    try:
+        with np.load(file_path) as data:
+            for keys, masks, target in ((data['keys'], data['masks'], mask_map),
+                                        (data['neg_ctrl_keys'], data['neg_ctrl_masks'], neg_ctrl_mask_map)):
+                # Skip the keys that are not in our current keys
+                for key, mask in zip(keys.tolist(), masks):
+                    if key in target:
+                        target[key] = mask
+        
+        logger.info(f"Masks loaded from {file_path}")
+    except Exception as e:
+        logger.error(f"Error loading masks: {e}")
 
 def save_grays_to_csv(file_path, section_grays):
     """
@@ -138,19 +247,17 @@ def save_grays_to_csv(file_path, section_grays):
         section_grays (dict): Dictionary of gray values for each section.
     """
     try:
-        with open(file_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            # Write header
-            writer.writerow(['plate_assay', 'section', 'gray_value'])
-        
-            # Write each gray value
-            for key, values in section_grays.items():
-                for i, value in enumerate(values):
-                    writer.writerow([key, i+1, value])
+        # Build the whole CSV in memory and write it to disk in a single call
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(['plate_assay', 'section', 'gray_value'])
+        writer.writerows((key, i + 1, value) for key, values in section_grays.items() for i, value in enumerate(values))
+        with open(file_path, 'w', newline='', buffering=1 << 16) as f:
+            f.write(buffer.getvalue())
     
-        logging.getLogger('plate_analyzer').info(f"Gray values saved to {file_path}")
+        logger.info(f"Gray values saved to {file_path}")
     except Exception as e:
-        logging.getLogger('plate_analyzer').error(f"Error saving gray values: {e}")
+        logger.error(f"Error saving gray values: {e}")
 
 def load_grays_from_csv(file_path, section_grays):
     """
@@ -161,31 +268,27 @@ def load_grays_from_csv(file_path, section_grays):
         section_grays (dict): Dictionary of gray values for each section to update.
     """
     if not os.path.exists(file_path):
-        logging.getLogger('plate_analyzer').warning(f"Gray file {file_path} not found. Using default values.")
+        logger.warning(f"Gray file {file_path} not found. Using default values.")
         return
     
     try:
-        # Read the CSV file
-        df = pd.read_csv(file_path)
-    
-        # Group by plate_assay
-        for key, group in df.groupby('plate_assay'):
+        # Read the CSV file, grouped by plate_assay
+        for key, block in _read_keyed_csv(file_path).items():
             # Skip if the key is not in our current keys
             if key not in section_grays:
                 continue
             
             # Initialize a new array for gray values
-            gray_values = [0, 0, 0, 0, 0, 0]
+            gray_values = np.zeros(6, dtype=float)
         
-            # Fill in gray values
-            for _, row in group.iterrows():
-                section = int(row['section'])
-                if 1 <= section <= 6:
-                    gray_values[section-1] = float(row['gray_value'])
+            # Fill in gray values (only sections 1-6)
+            sections = block[:, 0].astype(int)
+            valid = (sections >= 1) & (sections <= 6)
+            gray_values[sections[valid] - 1] = block[valid, 1]
         
             # Update gray values
-            section_grays[key] = gray_values
+            section_grays[key] = gray_values.tolist()
         
-        logging.getLogger('plate_analyzer').info(f"Gray values loaded from {file_path}")
+        logger.info(f"Gray values loaded from {file_path}")
     except Exception as e:
-        logging.getLogger('plate_analyzer').error(f"Error loading gray values: {e}")
+        logger.error(f"Error loading gray values: {e}")